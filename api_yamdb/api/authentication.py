@@ -0,0 +1,122 @@
+"""Модуль аутентификации приложения."""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+from users.token import ROLE_CLAIMS, TOKEN_VERSION_CLAIM
+
+
+class UserCache:
+    """
+    Кеш пользователей и версий их токенов в памяти процесса.
+
+    Хранит не больше maxsize записей, вытесняя давно не использованные,
+    и забывает каждую запись через ttl секунд.
+    """
+
+    def __init__(self, maxsize, ttl):
+        """Создаёт пустой кеш."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Возвращает копию пользователя из кеша или None."""
+        with self.lock:
+            expires, user = self.items.get(key, (0, None))
+            if expires < time.monotonic():
+                self.items.pop(key, None)
+                return None
+            self.items.move_to_end(key)
+        return copy.copy(user)
+
+    def set(self, key, user):
+        """Сохраняет пользователя в кеш."""
+        with self.lock:
+            self.items[key] = (time.monotonic() + self.ttl, copy.copy(user))
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Удаляет из кеша все записи пользователя."""
+        with self.lock:
+            for key in [key for key in self.items if key[0] == user_id]:
+                del self.items[key]
+
+    def clear(self):
+        """Очищает кеш."""
+        with self.lock:
+            self.items.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE,
+                       settings.AUTH_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT аутентификация с кешированием пользователя.
+
+    Пользователь ищется в кеше по id и jti токена, а в базу данных запрос
+    уходит только при промахе. Записи сбрасываются сигналами модели User.
+    Если токен содержит права пользователя (настройка JWT_ROLE_CLAIMS),
+    пользователь собирается из токена, а из кеша или базы берётся только
+    версия токенов для проверки отзыва.
+    """
+
+    def get_user(self, validated_token):
+        """Возвращает пользователя токена из кеша или базы данных."""
+        if settings.JWT_ROLE_CLAIMS and TOKEN_VERSION_CLAIM in validated_token:
+            return self.get_token_user(validated_token)
+        key = (validated_token.get(api_settings.USER_ID_CLAIM),
+               validated_token.get(api_settings.JTI_CLAIM))
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        return user
+
+    @staticmethod
+    def get_token_version(user_id):
+        """Возвращает текущую версию токенов активного пользователя."""
+        key = (user_id, TOKEN_VERSION_CLAIM)
+        version = user_cache.get(key)
+        if version is None:
+            version = User.objects.filter(
+                pk=user_id, is_active=True
+            ).values_list('token_version', flat=True).first()
+            if version is None:
+                raise AuthenticationFailed('Пользователь не найден',
+                                           code='user_not_found')
+            user_cache.set(key, version)
+        return version
+
+    def get_token_user(self, validated_token):
+        """
+        Собирает пользователя из прав, записанных в токен.
+
+        Остальные поля пользователя отложены и загружаются из базы только
+        при обращении к ним.
+        """
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = validated_token[TOKEN_VERSION_CLAIM]
+        if self.get_token_version(user_id) != version:
+            raise AuthenticationFailed('Токен отозван', code='token_revoked')
+        claims = {claim: validated_token[claim] for claim in ROLE_CLAIMS}
+        values = {'id': user_id, 'is_active': True, 'token_version': version,
+                  **claims}
+        fields = [field.attname for field in User._meta.concrete_fields
+                  if field.attname in values]
+        return User.from_db(DEFAULT_DB_ALIAS, fields,
+                            [values[field] for field in fields])
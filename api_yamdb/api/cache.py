@@ -0,0 +1,190 @@
+"""Модуль кешей API: ответов и слагов категорий и жанров."""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from reviews.models import Category, Genre
+
+# Заголовки, которые сохраняются вместе с содержимым ответа.
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """
+    Кеш отрендеренных ответов, разделённый на области.
+
+    Ключ ответа содержит текущее поколение его области, поэтому сброс
+    области - это замена её поколения, а старые ответы просто перестают
+    читаться и вытесняются по таймауту.
+    """
+
+    def __init__(self):
+        """Создаёт кеш с нулевыми счётчиками попаданий и промахов."""
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """Бэкенд кеша из настройки RESPONSE_CACHE_ALIAS."""
+        return caches[settings.RESPONSE_CACHE_ALIAS]
+
+    def generation(self, scope):
+        """Возвращает текущее поколение области."""
+        key = f'response:generation:{scope}'
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, uuid.uuid4().hex, timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def invalidate(self, *scopes):
+        """Сбрасывает все ответы указанных областей."""
+        for scope in scopes:
+            self.cache.set(f'response:generation:{scope}', uuid.uuid4().hex,
+                           timeout=None)
+
+    def invalidate_on_commit(self, *scopes):
+        """Сбрасывает области после фиксации текущей транзакции.
+
+        Если сбросить поколение до фиксации, параллельный запрос может
+        прочитать ещё старые данные и сохранить их в кеш уже с новым
+        поколением. Вне транзакции области сбрасываются сразу.
+        """
+        transaction.on_commit(lambda: self.invalidate(*scopes))
+
+    def make_key(self, scope, request):
+        """Строит ключ ответа по пути, параметрам и формату запроса."""
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        return self.scoped_key(
+            'response', scope,
+            f'{request.accepted_media_type}:{request.path}?{query}')
+
+    def scoped_key(self, prefix, scope, value):
+        """Строит ключ значения в текущем поколении области."""
+        digest = hashlib.md5(value.encode()).hexdigest()
+        return f'{prefix}:{scope}:{self.generation(scope)}:{digest}'
+
+    def get(self, key):
+        """Возвращает сохранённый ответ и учитывает попадание или промах."""
+        cached = self.cache.get(key)
+        self.count('hit' if cached is not None else 'miss')
+        return cached
+
+    def set(self, key, response):
+        """Сохраняет содержимое, тип и валидаторы отрендеренного ответа."""
+        headers = {name: response[name] for name in CACHED_HEADERS
+                   if response.has_header(name)}
+        self.cache.set(key,
+                       (response.content, response['Content-Type'], headers),
+                       settings.RESPONSE_CACHE_TIMEOUT)
+
+    def count(self, event):
+        """Увеличивает счётчик события кеша."""
+        with self.lock:
+            self.stats[event] += 1
+
+
+response_cache = ResponseCache()
+
+
+class SlugRegistry:
+    """
+    Объекты небольшой модели по слагам в памяти процесса.
+
+    Модель загружается целиком одним запросом и перечитывается, когда
+    меняется поколение её области в кеше ответов. Поколение сбрасывают
+    сигналы сохранения и удаления, но другие процессы видят сброс, только
+    если кеш общий (например, Redis или Memcached). С кешем в памяти
+    процесса реестр может устареть, поэтому он перечитывается не реже, чем
+    раз в SLUG_REGISTRY_MAX_AGE секунд, а при записи объекты по слагам
+    сверяются с базой методом confirm.
+    """
+
+    fields = ('id', 'name', 'slug')
+
+    def __init__(self, model, scope):
+        """Создаёт пустой реестр модели."""
+        self.model = model
+        self.scope = scope
+        self.generation = None
+        self.loaded_at = float('-inf')
+        self.rows = {}
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        """Реестр общий для процесса и не копируется вместе с полями."""
+        return self
+
+    def get_rows(self, reload=False):
+        """Возвращает строки модели по слагам, перечитывая устаревшие."""
+        generation = response_cache.generation(self.scope)
+        now = time.monotonic()
+        with self.lock:
+            if (reload or generation != self.generation
+                    or now - self.loaded_at > settings.SLUG_REGISTRY_MAX_AGE):
+                self.rows = {
+                    row[-1]: row for row in
+                    self.model.objects.values_list(*self.fields)
+                }
+                self.generation = generation
+                self.loaded_at = now
+            return self.rows
+
+    def confirm(self, slugs):
+        """Сверяет строки слагов с базой одним запросом.
+
+        Устаревшие строки заменяются прочитанными, а строки удалённых
+        объектов убираются из реестра.
+        """
+        slugs = {slug for slug in slugs if isinstance(slug, str)}
+        if not slugs:
+            return
+        current = self.get_rows()
+        rows = {
+            row[-1]: row for row in
+            self.model.objects.filter(slug__in=slugs).order_by()
+            .values_list(*self.fields)
+        }
+        if all(current.get(slug) == rows.get(slug) for slug in slugs):
+            return
+        with self.lock:
+            self.rows = {
+                **{slug: row for slug, row in self.rows.items()
+                   if slug not in slugs},
+                **rows,
+            }
+
+    def get_row(self, slug):
+        """Возвращает строку по слагу.
+
+        Неизвестный слаг перечитывает модель, чтобы найти объекты,
+        добавленные без сигналов, например через bulk_create.
+        """
+        row = self.get_rows().get(slug)
+        if row is None:
+            row = self.get_rows(reload=True).get(slug)
+        return row
+
+    def get(self, slug):
+        """Возвращает объект по слагу или None."""
+        row = self.get_row(slug)
+        if row is None:
+            return None
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.fields, row)
+
+    def get_id(self, slug):
+        """Возвращает id объекта по слагу или None."""
+        row = self.get_row(slug)
+        return None if row is None else row[0]
+
+
+category_slugs = SlugRegistry(Category, 'categories')
+genre_slugs = SlugRegistry(Genre, 'genres')
@@ -1,19 +1,44 @@
 """Модуль фильтра приложения."""
 
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from .cache import category_slugs, genre_slugs
 
 
 class TitleFilter(filters.FilterSet):
     """Кастомный фильтр для Title."""
 
     name = filters.CharFilter(field_name='name', lookup_expr='contains')
-    category = filters.CharFilter(field_name='category__slug')
-    genre = filters.CharFilter(field_name='genre__slug')
+    category = filters.CharFilter(method='filter_by_slug')
+    genre = filters.CharFilter(method='filter_by_slug')
+
+    # Реестры, в которых фильтры находят id по слагу без join.
+    registries = {'category': category_slugs, 'genre': genre_slugs}
+
+    def filter_by_slug(self, queryset, name, value):
+        """Фильтрует произведения по id категории или жанра с этим слагом."""
+        pk = self.registries[name].get_id(value)
+        if pk is None:
+            return queryset.none()
+        return queryset.filter(**{name: pk})
 
     class Meta:
         """Мета класс."""
 
         model = Title
         fields = ['name', 'year', 'category', 'genre']
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений с сортировкой по релевантности."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        """Ищет произведения по параметру search."""
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return queryset.search(query)
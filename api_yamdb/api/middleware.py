@@ -0,0 +1,126 @@
+"""Модуль middleware проекта."""
+
+import gzip
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def accepted_encodings(header):
+    """Возвращает кодировки из Accept-Encoding, кроме запрещённых q=0."""
+    encodings = set()
+    for item in header.split(','):
+        coding, *params = (part.strip() for part in item.split(';'))
+        qualities = [param[2:] for param in params if param.startswith('q=')]
+        try:
+            if qualities and float(qualities[0]) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(coding.lower())
+    return encodings
+
+
+class CompressionStats:
+    """Накопленные размеры ответов и время их сжатия."""
+
+    def __init__(self):
+        """Создаёт пустую статистику."""
+        self.totals = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, encoding, original, compressed, elapsed):
+        """Учитывает один сжатый ответ."""
+        with self.lock:
+            self.totals[f'{encoding}_responses'] += 1
+            self.totals['original_bytes'] += original
+            self.totals['compressed_bytes'] += compressed
+            self.totals['seconds'] += elapsed
+
+    @property
+    def ratio(self):
+        """Среднее отношение исходного размера ответов к сжатому."""
+        if not self.totals['compressed_bytes']:
+            return None
+        return self.totals['original_bytes'] / self.totals['compressed_bytes']
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы API в brotli или gzip.
+
+    Сжимаются ответы с типами из COMPRESSION_CONTENT_TYPES размером не меньше
+    COMPRESSION_MIN_SIZE байт, кроме 304 и 204. Brotli используется, если
+    установлен пакет brotli и клиент его принимает.
+    """
+
+    def compress(self, encoding, content):
+        """Сжимает содержимое ответа выбранным способом."""
+        if encoding == 'br':
+            return brotli.compress(content,
+                                   quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return gzip.compress(content, settings.COMPRESSION_GZIP_LEVEL,
+                             mtime=0)
+
+    def choose_encoding(self, request):
+        """Выбирает способ сжатия по заголовку Accept-Encoding."""
+        encodings = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in encodings:
+            return 'br'
+        if 'gzip' in encodings:
+            return 'gzip'
+        return None
+
+    def is_compressible(self, response):
+        """Проверяет, что ответ имеет смысл сжимать."""
+        content_type = response.get('Content-Type', '').split(';')[0]
+        return (not response.streaming
+                and response.status_code not in (204, 304)
+                and not response.has_header('Content-Encoding')
+                and content_type in settings.COMPRESSION_CONTENT_TYPES
+                and len(response.content) >= settings.COMPRESSION_MIN_SIZE)
+
+    def process_response(self, request, response):
+        """Сжимает ответ, если клиент это поддерживает."""
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+        original = len(response.content)
+        started = time.perf_counter()
+        compressed = self.compress(encoding, response.content)
+        elapsed = time.perf_counter() - started
+        if len(compressed) >= original:
+            return response
+        compression_stats.add(encoding, original, len(compressed), elapsed)
+        logger.debug('%s %s: %s %d -> %d байт (%.1fx) за %.2f мс',
+                     request.method, request.path, encoding, original,
+                     len(compressed), original / len(compressed),
+                     elapsed * 1000)
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # Сжатое тело отличается побайтно, поэтому сильный ETag становится
+        # слабым, как в django.middleware.gzip.GZipMiddleware.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -1,13 +1,127 @@
 """Модуль с миксинами приложения."""
 
+import hashlib
+from calendar import timegm
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, viewsets
+from rest_framework import filters, mixins, status, viewsets
 
+from .cache import response_cache
 from .permissions import IsAdminUserOrReadOnly
 
 
-class CategoryGenreViewSet(mixins.CreateModelMixin, mixins.ListModelMixin,
-                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+class CachedListMixin:
+    """
+    Миксин кеширования списков для анонимных GET-запросов.
+
+    Ответы хранятся в области cache_scope, в которую можно подставить
+    параметры маршрута, например 'reviews:{title_id}'.
+    Области сбрасываются сигналами при изменении данных.
+    """
+
+    cache_scope = None
+
+    def get_cache_scope(self):
+        """Возвращает область кеша с нормализованными параметрами маршрута.
+
+        Числовые параметры приводятся к int, чтобы /titles/01/reviews/
+        попадал в ту же область reviews:1, которую сбрасывают сигналы.
+        """
+        kwargs = {
+            name: int(value) if str(value).isdecimal() else value
+            for name, value in self.kwargs.items()
+        }
+        return self.cache_scope.format(**kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список из кеша или формирует его."""
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def cached(self, handler, request, *args, **kwargs):
+        """Отдаёт сохранённый ответ или сохраняет новый после рендеринга."""
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = response_cache.make_key(self.get_cache_scope(), request)
+        cached = response_cache.get(key)
+        if cached is not None:
+            content, content_type, headers = cached
+            response = HttpResponse(content, content_type=content_type)
+            for name, value in headers.items():
+                response[name] = value
+            response['X-Cache'] = 'HIT'
+            return get_conditional_response(
+                request, etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified')),
+                response=response)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.add_post_render_callback(
+                lambda rendered: response_cache.set(key, rendered))
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedResponseMixin(CachedListMixin):
+    """Миксин кеширования списков и отдельных объектов."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает объект из кеша или формирует его."""
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalResponseMixin:
+    """
+    Миксин условных GET-запросов по версии данных.
+
+    ETag и Last-Modified вычисляются по версии и времени изменения объекта
+    из get_versioned_object до сериализации, поэтому на совпавший
+    If-None-Match ответ 304 отдаётся без обращения к сериализаторам.
+    """
+
+    def get_versioned_object(self):
+        """Возвращает объект с полями version и modified или None.
+
+        По умолчанию версии нет, и ответ отдаётся без валидаторов.
+        """
+        return None
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список или ответ 304."""
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает объект или ответ 304."""
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    def conditional(self, handler, request, *args, **kwargs):
+        """Отвечает 304 на актуальную копию клиента или формирует ответ."""
+        obj = self.get_versioned_object()
+        if obj is None:
+            return handler(request, *args, **kwargs)
+        etag = quote_etag(hashlib.md5(
+            f'{obj.version}:{obj.modified.isoformat()}:'
+            f'{request.accepted_media_type}:{request.get_full_path()}'
+            .encode()
+        ).hexdigest())
+        last_modified = timegm(obj.modified.utctimetuple())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class CategoryGenreViewSet(CachedListMixin, mixins.CreateModelMixin,
+                           mixins.ListModelMixin, mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
     """Миксин для категорий и жанров."""
 
     permission_classes = [IsAdminUserOrReadOnly]
@@ -0,0 +1,173 @@
+"""Модуль пагинации приложения."""
+
+from collections import OrderedDict
+from functools import partial
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import response_cache
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, хранящий количество объектов в кеше ответов."""
+
+    def __init__(self, *args, count_key=None, **kwargs):
+        """Запоминает ключ кеша для количества объектов."""
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        """Возвращает количество объектов из кеша или считает его."""
+        if self.count_key is None:
+            return super().count
+        count = response_cache.cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            response_cache.cache.set(self.count_key, count,
+                                     settings.RESPONSE_CACHE_TIMEOUT)
+        return count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с кешированием количества объектов.
+
+    Количество хранится для пути и набора фильтров в области cache_scope
+    представления и сбрасывается вместе с её ответами. Параметр
+    ``count=estimated`` отключает подсчёт: в ответе возвращается
+    сохранённое количество или null, а наличие следующей страницы
+    определяется по одной лишней записи.
+    """
+
+    count_query_param = 'count'
+    estimated_count = 'estimated'
+    # Параметры, которые не влияют на количество объектов.
+    count_ignored_params = ('fields', 'omit', 'count', 'page', 'format')
+
+    def get_count_key(self, request, view):
+        """Возвращает ключ количества объектов или None без области кеша."""
+        if getattr(view, 'cache_scope', None) is None:
+            return None
+        params = sorted(
+            (name, values) for name, values in request.query_params.lists()
+            if name not in self.count_ignored_params
+        )
+        return response_cache.scoped_key(
+            'count', view.get_cache_scope(),
+            f'{request.path}?{urlencode(params, doseq=True)}')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Возвращает страницу, считая объекты не чаще изменения данных."""
+        count_key = self.get_count_key(request, view)
+        if (request.query_params.get(self.count_query_param)
+                == self.estimated_count):
+            return self.paginate_estimated(queryset, request, count_key)
+        self.django_paginator_class = partial(CachedCountPaginator,
+                                              count_key=count_key)
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_estimated(self, queryset, request, count_key):
+        """Возвращает страницу без подсчёта всех объектов."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        page_number = request.query_params.get(self.page_query_param, '1')
+        number = int(page_number) if page_number.isdigit() else 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number,
+                message='Номер страницы должен быть целым положительным'))
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='Страница пуста'))
+        self.request = request
+        self.estimated = OrderedDict(
+            count=(None if count_key is None
+                   else response_cache.cache.get(count_key)),
+            number=number,
+            has_next=len(rows) > page_size,
+        )
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        """Возвращает ответ с данными пагинации."""
+        estimated = getattr(self, 'estimated', None)
+        if estimated is None:
+            return super().get_paginated_response(data)
+        url = self.request.build_absolute_uri()
+        number = estimated['number']
+        next_url = previous_url = None
+        if estimated['has_next']:
+            next_url = replace_query_param(url, self.page_query_param,
+                                           number + 1)
+        if number == 2:
+            previous_url = remove_query_param(url, self.page_query_param)
+        elif number > 2:
+            previous_url = replace_query_param(url, self.page_query_param,
+                                               number - 1)
+        return Response(OrderedDict([
+            ('count', estimated['count']),
+            ('next', next_url),
+            ('previous', previous_url),
+            ('results', data),
+        ]))
+
+
+class FeedCursorPagination(CursorPagination):
+    """Курсорная пагинация по заданному порядку сортировки."""
+
+    def __init__(self, ordering):
+        """Запоминает порядок сортировки ленты."""
+        self.ordering = ordering
+
+
+class FeedPagination(CachedCountPagination):
+    """
+    Пагинация лент отзывов и комментариев.
+
+    По умолчанию работает постранично с кешированным количеством объектов,
+    а курсорный режим включается
+    параметром ``pagination=cursor`` или наличием параметра ``cursor``.
+    Курсор строится по сортировке модели из Meta.ordering, которую
+    поддерживает составной индекс.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def __init__(self):
+        """Создаёт пагинатор в постраничном режиме."""
+        self.cursor_paginator = None
+
+    def is_cursor_mode(self, request):
+        """Проверяет, запрошен ли курсорный режим."""
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == self.cursor_mode
+            or FeedCursorPagination.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Возвращает страницу в запрошенном режиме пагинации."""
+        if self.is_cursor_mode(request):
+            self.cursor_paginator = FeedCursorPagination(
+                queryset.model._meta.ordering)
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Возвращает ответ с данными пагинации текущего режима."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
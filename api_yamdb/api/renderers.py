@@ -0,0 +1,106 @@
+"""Модуль рендереров и парсеров API."""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON рендерер на orjson.
+
+    Формат совпадает с JSONRenderer: компактные разделители, символы вне
+    ASCII без экранирования, экранированные U+2028 и U+2029. Отличия:
+    числа с плавающей точкой с порядком записываются короче (1e16 вместо
+    1e+16, значение то же), а NaN и бесконечности становятся null, хотя
+    JSONRenderer на них падает с ValueError. Если orjson не установлен,
+    запрошен отступ или данные ему не подходят (например, целые длиннее
+    64 бит), работает JSONRenderer.
+    """
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        """Проверяет, что ответ можно отрендерить через orjson."""
+        return (orjson is not None and self.compact and self.strict
+                and not self.ensure_ascii
+                and self.get_indent(accepted_media_type,
+                                    renderer_context) is None)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Рендерит данные в JSON."""
+        if data is None or not self.use_orjson(accepted_media_type,
+                                               renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=(orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME),
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace(
+            '\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSON парсер на orjson с запасным вариантом на стандартном json."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбирает тело запроса в формате JSON."""
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower() not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Рендерер в формат MessagePack.
+
+    Выбирается заголовком Accept: application/msgpack. Значения, которых нет
+    в MessagePack, приводятся так же, как в JSON ответах.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Рендерит данные в MessagePack."""
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default)
+
+
+class MessagePackParser(BaseParser):
+    """Парсер тела запроса в формате MessagePack."""
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбирает тело запроса в формате MessagePack."""
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
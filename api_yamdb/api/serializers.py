@@ -1,23 +1,54 @@
 """Модуль сериалайзеров."""
+from collections.abc import Mapping
 from datetime import datetime
 
 from django.conf import settings
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import (MaxValueValidator,
                                     MinValueValidator,
                                     RegexValidator)
 from django.shortcuts import get_object_or_404
 
-from rest_framework import serializers, status
-from rest_framework.response import Response
+from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
 from reviews.models import Category, Comments, Genre, Review, Title
 from users.models import User
+from .cache import category_slugs, genre_slugs
 
 
 USERNAME_CHECK = r'^[\w.@+-]+$'  # Проверка имени на отсутствие спецсимволов
 
 
+def selected_fields(request, names):
+    """Возвращает поля из names, выбранные параметрами fields и omit.
+
+    Параметры учитываются только в GET-запросах и перечисляются через
+    запятую, неизвестные поля игнорируются.
+    """
+    if request is None or request.method != 'GET':
+        return list(names)
+    params = request.query_params
+    selected = list(names)
+    if params.get('fields'):
+        requested = set(params['fields'].split(','))
+        selected = [name for name in selected if name in requested]
+    if params.get('omit'):
+        omitted = set(params['omit'].split(','))
+        selected = [name for name in selected if name not in omitted]
+    return selected
+
+
+class SparseFieldsMixin:
+    """Миксин сериализатора, оставляющий поля из параметров fields и omit."""
+
+    def get_fields(self):
+        """Возвращает только выбранные поля."""
+        fields = super().get_fields()
+        keep = selected_fields(self.context.get('request'), fields)
+        return {name: fields[name] for name in keep}
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор для пользователей."""
 
@@ -56,41 +87,30 @@ class GetTokenSerializer(serializers.Serializer):
         max_length=settings.CONFIRMATION_CODE_LENGTH)
 
     def validate(self, data):
-        """Проверяет корректность имени пользователя и кода доступа."""
-        username = data.get('username')
-        confirmation_code = data.get('confirmation_code')
-
-        if not username:
-            raise serializers.ValidationError('Нет поля username')
-
-        try:
-            user = get_object_or_404(User, username=username)
-        except User.DoesNotExist:
-            raise serializers.ValidationError(
-                'Пользователь с таким именем не найден')
-
-        if user.username != username:
-            return Response(
-                {'detail': 'Неверный код доступа'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        if user.confirmation_code != confirmation_code:
+        """Проверяет код доступа и добавляет пользователя в данные."""
+        user = get_object_or_404(
+            User.objects.only('id', 'username', 'confirmation_code',
+                              *User.ROLE_FIELDS, 'token_version'),
+            username=data['username'],
+        )
+        if user.confirmation_code != data['confirmation_code']:
             raise serializers.ValidationError('Неверный код доступа')
-
+        data['user'] = user
         return data
 
 
-class SignupSerializer(serializers.ModelSerializer):
-    """Сериализатор для регистрации пользователей."""
+class SignupSerializer(serializers.Serializer):
+    """Сериализатор для регистрации пользователей.
 
-    email = serializers.EmailField(max_length=settings.LENGTH_EMAIL)
-
-    class Meta:
-        """Мета класс."""
+    Уникальность не проверяется: повторная регистрация существующего
+    пользователя лишь обновляет его код подтверждения.
+    """
 
-        fields = ('username', 'email')
-        model = User
+    username = serializers.CharField(
+        max_length=settings.LENGTH_USERNAME,
+        validators=[UnicodeUsernameValidator()],
+    )
+    email = serializers.EmailField(max_length=settings.LENGTH_EMAIL)
 
     def validate_username(self, value):
         """Проверяет, что имя пользователя не равно "me"."""
@@ -121,7 +141,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ['name', 'slug']
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для отзывов на произведения."""
 
     author = serializers.SlugRelatedField(
@@ -158,7 +178,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для комментариев к отзывам."""
 
     author = serializers.SlugRelatedField(
@@ -175,16 +195,51 @@ class CommentsSerializer(serializers.ModelSerializer):
         read_only_fields = ('pub_date', 'review')
 
 
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """Поле слага, которое находит объект в реестре слагов без запроса."""
+
+    def __init__(self, registry, **kwargs):
+        """Создаёт поле для модели реестра."""
+        self.registry = registry
+        super().__init__(slug_field='slug',
+                         queryset=registry.model.objects.all(), **kwargs)
+
+    def to_internal_value(self, data):
+        """Возвращает объект по слагу из реестра."""
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.registry.get(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+
+def confirm_title_slugs(items):
+    """Сверяет с базой слаги категорий и жанров из данных произведений.
+
+    На каждую модель выполняется один запрос, сколько бы произведений
+    ни было в items.
+    """
+    items = [item for item in items if isinstance(item, Mapping)]
+    category_slugs.confirm(item.get('category') for item in items)
+    genres = []
+    for item in items:
+        if hasattr(item, 'getlist'):
+            genres.extend(item.getlist('genre'))
+        elif isinstance(item.get('genre'), list):
+            genres.extend(item['genre'])
+    genre_slugs.confirm(genres)
+
+
 class TitleSerializer(serializers.ModelSerializer):
-    """Сериализатор для произведений."""
-
-    category = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Category.objects.all())
-    genre = serializers.SlugRelatedField(
-        many=True,
-        slug_field='slug',
-        queryset=Genre.objects.all())
+    """Сериализатор для произведений.
+
+    Если в контексте нет slugs_confirmed, слаги сверяются с базой перед
+    разбором полей.
+    """
+
+    category = RegistrySlugRelatedField(category_slugs)
+    genre = RegistrySlugRelatedField(genre_slugs, many=True)
     year = serializers.IntegerField(
         validators=[MinValueValidator(settings.MIN_YEAR),
                     MaxValueValidator(datetime.now().year)])
@@ -193,10 +248,16 @@ class TitleSerializer(serializers.ModelSerializer):
         """Мета класс."""
 
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
+    def to_internal_value(self, data):
+        """Сверяет слаги с базой и разбирает данные произведения."""
+        if not self.context.get('slugs_confirmed'):
+            confirm_title_slugs([data])
+        return super().to_internal_value(data)
 
-class TitleGetSerializer(serializers.ModelSerializer):
+
+class TitleGetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для произведений с детальной информацией."""
 
     category = CategorySerializer()
@@ -207,4 +268,5 @@ class TitleGetSerializer(serializers.ModelSerializer):
         """Мета класс."""
 
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'rating', 'description', 'genre',
+                  'category')
@@ -0,0 +1,78 @@
+"""Модуль сигналов приложения API."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
+from users.models import User
+from .authentication import user_cache
+from .cache import response_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Сбрасывает кеш аутентификации изменённого пользователя."""
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, created, **kwargs):
+    """Сбрасывает отзывы и комментарии переименованного автора."""
+    if created or not instance.username_changed:
+        return
+    scopes = {
+        f'reviews:{title_id}' for title_id in
+        Review.objects.filter(author=instance).values_list('title_id',
+                                                           flat=True)
+    } | {
+        f'comments:{review_id}' for review_id in
+        Comments.objects.filter(author=instance).values_list('review_id',
+                                                             flat=True)
+    }
+    if scopes:
+        response_cache.invalidate_on_commit(*scopes)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    """Сбрасывает ответы с категориями, в том числе внутри произведений."""
+    response_cache.invalidate_on_commit('categories', 'titles')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, instance, **kwargs):
+    """Сбрасывает ответы с жанрами, в том числе внутри произведений."""
+    response_cache.invalidate_on_commit('genres', 'titles')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    """Сбрасывает ответы с произведениями и отзывы удалённого произведения."""
+    response_cache.invalidate_on_commit('titles', f'reviews:{instance.pk}')
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, **kwargs):
+    """Сбрасывает ответы с произведениями при изменении их жанров."""
+    response_cache.invalidate_on_commit('titles')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    """Сбрасывает отзывы произведения и его рейтинг в списке произведений."""
+    response_cache.invalidate_on_commit(
+        f'reviews:{instance.title_id}', 'titles', f'comments:{instance.pk}')
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def invalidate_comment(sender, instance, **kwargs):
+    """Сбрасывает комментарии отзыва."""
+    response_cache.invalidate_on_commit(f'comments:{instance.review_id}')
@@ -1,6 +1,8 @@
 """Модуль контроллеров приложения."""
 
-from django.db.models import Avg
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
@@ -9,21 +11,25 @@ from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Genre, GenreTitle, Review, Title
 from users.models import User
-from .filters import TitleFilter
-from .mixins import CategoryGenreViewSet
+from users.token import get_access_token
+from .cache import response_cache
+from .filters import TitleFilter, TitleSearchFilter
+from .mixins import (CachedResponseMixin, CategoryGenreViewSet,
+                     ConditionalResponseMixin)
+from .pagination import FeedPagination
 from .permissions import (IsAdminModeratorAuthorOrReadOnly, IsAdminOrStaff,
                           IsAdminUserOrReadOnly)
 from .serializers import (CategorySerializer, CommentsSerializer,
                           GenreSerializer, GetTokenSerializer,
                           ReviewSerializer, TitleSerializer,
                           TitleGetSerializer, SignupSerializer,
-                          UserSerializer, UsersMeSerializer)
-from .utils import send_confirmation_code_to_email
+                          UserSerializer, UsersMeSerializer,
+                          confirm_title_slugs, selected_fields)
+from .utils import make_confirmation_code, send_confirmation_code_to_email
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -45,6 +51,8 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         """Отображает/обновляет данные текущего пользователя."""
+        if request.user.get_deferred_fields():
+            request.user.refresh_from_db()
         if request.method == 'GET':
             serializer = UserSerializer(request.user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -63,44 +71,48 @@ class SignupView(APIView):
 
     permission_classes = (AllowAny,)
 
+    @transaction.atomic
     def post(self, request):
         """Создает нового/обновляет пользователя."""
-        username = request.data.get('username')
-        if User.objects.filter(username=username).exists():
-            user = get_object_or_404(User, username=username)
-            serializer = SignupSerializer(
-                user, data=request.data, partial=True
-            )
-            serializer.is_valid(raise_exception=True)
-            if serializer.validated_data['email'] != user.email:
-                return Response(
-                    'Почта указана неверно!',
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            serializer.save(raise_exception=True)
-            send_confirmation_code_to_email(request)
-            return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = SignupSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        if User.objects.filter(
-                email=serializer.validated_data['email']
-        ).exists():
+        username = serializer.validated_data['username']
+        email = serializer.validated_data['email']
+        users = list(
+            User.objects.filter(Q(username=username) | Q(email=email))
+        )
+        user = next(
+            (user for user in users if user.username == username), None
+        )
+        if user is not None and user.email != email:
+            return Response(
+                'Почта указана неверно!',
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if user is None and users:
             return Response(
                 'Пользователь с таким адресом электронной '
                 'почты уже существует',
                 status=status.HTTP_400_BAD_REQUEST
             )
-        if serializer.validated_data['username'] != 'admin':
-            serializer.save()
-            send_confirmation_code_to_email(request)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(
-            (
-                'Использование имени пользователя '
-                'admin запрещено!'
-            ),
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        if user is None and username == 'admin':
+            return Response(
+                (
+                    'Использование имени пользователя '
+                    'admin запрещено!'
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if user is None:
+            user = User.objects.create(
+                username=username, email=email,
+                confirmation_code=make_confirmation_code()
+            )
+        else:
+            user.confirmation_code = make_confirmation_code()
+            user.save(update_fields=['confirmation_code'])
+        send_confirmation_code_to_email(user)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class GetTokenView(TokenObtainPairView):
@@ -113,16 +125,7 @@ class GetTokenView(TokenObtainPairView):
         """Получает токен для указанного пользователя."""
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        username = serializer.validated_data['username']
-        confirmation_code = serializer.validated_data['confirmation_code']
-
-        user = get_object_or_404(User, username=username)
-        if user.confirmation_code != confirmation_code:
-            return Response(
-                'Неверный код доступа',
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        token = AccessToken.for_user(user)
+        token = get_access_token(serializer.validated_data['user'])
         return Response(str(token), status=status.HTTP_200_OK)
 
 
@@ -131,6 +134,7 @@ class CategoryViewSet(CategoryGenreViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_scope = 'categories'
 
 
 class GenreViewSet(CategoryGenreViewSet):
@@ -138,9 +142,11 @@ class GenreViewSet(CategoryGenreViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_scope = 'genres'
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CachedResponseMixin, ConditionalResponseMixin,
+                    viewsets.ModelViewSet):
     """ViewSet для модели Review."""
 
     serializer_class = ReviewSerializer
@@ -148,18 +154,28 @@ class ReviewViewSet(viewsets.ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAdminModeratorAuthorOrReadOnly,
     )
+    pagination_class = FeedPagination
+    cache_scope = 'reviews:{title_id}'
 
     def title_get_or_404(self):
-        """Получение объекта Title или 404."""
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
+        """Получение объекта Title или 404, один раз за запрос."""
+        if not hasattr(self, 'title'):
+            self.title = get_object_or_404(
+                Title,
+                id=self.kwargs.get('title_id'))
+        return self.title
+
+    def get_versioned_object(self):
+        """Версия отзывов - версия их произведения."""
+        return self.title_get_or_404()
 
     def get_queryset(self):
         """Получение queryset объектов Review или 404."""
         title = self.title_get_or_404()
-        return title.reviews.all()
+        return title.reviews.select_related('author').only(
+            'text', 'score', 'pub_date', 'title', 'author__username')
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Сохраняет новый объект Review."""
         title = self.title_get_or_404()
@@ -167,21 +183,40 @@ class ReviewViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, title=title)
         return Response(status=status.HTTP_201_CREATED)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Обновляет отзыв вместе с рейтингом произведения."""
+        super().perform_update(serializer)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Удаляет отзыв вместе с его оценкой из рейтинга произведения."""
+        super().perform_destroy(instance)
+
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(CachedResponseMixin, ConditionalResponseMixin,
+                      viewsets.ModelViewSet):
     """ViewSet для модели Comments."""
 
     serializer_class = CommentsSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAdminModeratorAuthorOrReadOnly,)
+    pagination_class = FeedPagination
+    cache_scope = 'comments:{review_id}'
 
     def review_get_or_404(self):
-        """Получение объекта Review или 404."""
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
-        )
+        """Получение объекта Review с произведением или 404."""
+        if not hasattr(self, 'review'):
+            self.review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs.get('review_id'),
+                title__id=self.kwargs.get('title_id'),
+            )
+        return self.review
+
+    def get_versioned_object(self):
+        """Версия комментариев - версия произведения их отзыва."""
+        return self.review_get_or_404().title
 
     def perform_create(self, serializer):
         """Сохраняет новый объект Comment."""
@@ -191,16 +226,19 @@ class CommentsViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Получение объекта Comment или 404."""
         review = self.review_get_or_404()
-        return review.comments.all()
+        return review.comments.select_related('author').only(
+            'text', 'pub_date', 'review', 'author__username')
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(CachedResponseMixin, ConditionalResponseMixin,
+                   viewsets.ModelViewSet):
     """ViewSet для модели Title."""
 
     permission_classes = [IsAdminUserOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, TitleSearchFilter]
     filterset_class = TitleFilter
     serializer_class = TitleGetSerializer
+    cache_scope = 'titles'
 
     def get_serializer_class(self):
         """Возвращает сериализатор под текущий метод запроса."""
@@ -209,8 +247,137 @@ class TitleViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def get_queryset(self):
-        """Возвращает queryset с добавлением поля rating."""
+        """Возвращает queryset произведений только с нужными в ответе полями.
+
+        Категория и жанры подгружаются, если они выбраны параметрами
+        fields и omit, а невыбранные описание и рейтинг не читаются.
+        """
+        fields = selected_fields(self.request, TitleGetSerializer.Meta.fields)
         queryset = Title.objects.all()
-        if self.action in ['list', 'retrieve']:
-            queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+        if 'category' in fields:
+            queryset = queryset.select_related('category')
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related('genre')
+        if 'description' not in fields:
+            queryset = queryset.defer('description')
+        if 'rating' not in fields:
+            queryset = queryset.defer(*Title.RATING_FIELDS)
         return queryset
+
+    def get_object(self):
+        """Получение произведения один раз за запрос."""
+        if not hasattr(self, 'title'):
+            self.title = super().get_object()
+        return self.title
+
+    def get_versioned_object(self):
+        """Версия отдельного произведения, у списка версии нет."""
+        if self.action == 'retrieve':
+            return self.get_object()
+        return None
+
+    @staticmethod
+    def get_bulk_id(item):
+        """Возвращает id элемента пачки, если это целое число."""
+        pk = item.get('id') if isinstance(item, dict) else None
+        if isinstance(pk, int) and not isinstance(pk, bool):
+            return pk
+        return None
+
+    def validate_bulk_item(self, item, existing, seen):
+        """Проверяет элемент пачки, возвращает сериализатор или ошибки.
+
+        В seen собираются id уже проверенных элементов: одно произведение
+        можно изменить в пачке только один раз.
+        """
+        pk = self.get_bulk_id(item)
+        if pk is None and isinstance(item, dict) and 'id' in item:
+            return None, {'id': ['Ожидается целое число.']}
+        if pk in seen:
+            return None, {'id': [f'Произведение с id={pk} уже есть в пачке.']}
+        if pk is not None:
+            seen.add(pk)
+        instance = existing.get(pk)
+        if pk is not None and instance is None:
+            return None, {'id': [f'Произведение с id={pk} не найдено.']}
+        serializer = TitleSerializer(
+            instance, data=item, partial=instance is not None,
+            context={**self.get_serializer_context(),
+                     'slugs_confirmed': True})
+        if not serializer.is_valid():
+            return None, serializer.errors
+        return serializer, None
+
+    @transaction.atomic
+    def save_bulk(self, serializers):
+        """Сохраняет новые и изменённые произведения и их жанры пачками."""
+        created = [item for item in serializers if item.instance is None]
+        updated = [item for item in serializers if item.instance is not None]
+        titles = Title.objects.bulk_create_returning([
+            Title(**{name: value
+                     for name, value in item.validated_data.items()
+                     if name != 'genre'})
+            for item in created
+        ])
+        for item, title in zip(created, titles):
+            item.instance = title
+        fields = set()
+        for item in updated:
+            for name, value in item.validated_data.items():
+                if name != 'genre':
+                    setattr(item.instance, name, value)
+                    fields.add(name)
+        if fields:
+            Title.objects.bulk_update([item.instance for item in updated],
+                                      fields)
+        GenreTitle.objects.filter(title__in=[
+            item.instance for item in updated
+            if 'genre' in item.validated_data
+        ]).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=item.instance, genre=genre)
+            for item in serializers
+            for genre in dict.fromkeys(item.validated_data.get('genre', ()))
+        )
+        Title.objects.filter(
+            pk__in=[item.instance.pk for item in updated]).touch()
+        response_cache.invalidate_on_commit('titles')
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Создаёт и обновляет список произведений за одну транзакцию.
+
+        Элементы с id частично обновляют существующие произведения,
+        остальные создают новые. Элементы с ошибками пропускаются, а для
+        каждого элемента возвращается статус и данные или ошибки.
+        """
+        items = request.data
+        if (not isinstance(items, list)
+                or len(items) > settings.TITLES_BULK_LIMIT):
+            return Response(
+                {'detail': 'Ожидается список не более чем из '
+                           f'{settings.TITLES_BULK_LIMIT} произведений.'},
+                status=status.HTTP_400_BAD_REQUEST)
+        existing = Title.objects.in_bulk(
+            {self.get_bulk_id(item) for item in items} - {None})
+        confirm_title_slugs(items)
+        seen = set()
+        checked = [self.validate_bulk_item(item, existing, seen)
+                   for item in items]
+        valid = [serializer for serializer, _ in checked if serializer]
+        if valid:
+            self.save_bulk(valid)
+        saved = Title.objects.select_related('category').prefetch_related(
+            'genre').in_bulk([serializer.instance.pk for serializer in valid])
+        results = []
+        for serializer, errors in checked:
+            if serializer is None:
+                results.append({'status': status.HTTP_400_BAD_REQUEST,
+                                'errors': errors})
+                continue
+            results.append({
+                'status': (status.HTTP_200_OK if serializer.partial
+                           else status.HTTP_201_CREATED),
+                'data': TitleSerializer(saved[serializer.instance.pk]).data,
+            })
+        return Response(results, status=status.HTTP_200_OK)
@@ -2,6 +2,7 @@
 
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -35,6 +36,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +77,15 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -117,15 +128,36 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CachedCountPagination',
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
+# Формат MessagePack доступен, если установлен пакет msgpack.
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] += (
+        'api.renderers.MessagePackParser',
+    )
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] += (
+        'api.renderers.MessagePackRenderer',
+    )
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Записывать права пользователя в токен и проверять их без запроса к базе.
+JWT_ROLE_CLAIMS = False
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=10),
     "AUTH_HEADER_TYPES": ("Bearer",),
@@ -140,7 +172,13 @@ MIN_SCORE_VALUE = 1
 MAX_SCORE_VALUE = 10
 
 ADMIN_EMAIL = 'admin@yamdb.com'
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60
 BIO_LENGTH = 300
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CONTENT_TYPES = ('application/json', 'application/msgpack')
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_MIN_SIZE = 1024
 CONFIRMATION_CODE = 'abcdefghijklmnopqrstuvwxyz123456789'
 CONFIRMATION_CODE_LENGTH = 16
 DEFAULT_ROLE = 'user'
@@ -151,4 +189,12 @@ LEN_NAME = 256
 LEN_SLUG = 50
 MIN_YEAR = 1900
 NOT_ALLOWED_USERNAME = 'me'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_CLAIM_TIMEOUT = 300
+OUTBOX_MAX_ATTEMPTS = 5
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
 ROLE_LENGTH = 16
+SLUG_REGISTRY_MAX_AGE = 5
+TITLE_SEARCH_BACKEND = 'reviews.search.SQLiteFTSBackend'
+TITLES_BULK_LIMIT = 1000
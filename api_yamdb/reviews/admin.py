@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from reviews.models import Category, Comments, Genre, Review, Title
+from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -21,9 +21,18 @@ class GenreAdmin(admin.ModelAdmin):
     empty_value_diplay = '-пусто-'
 
 
+class GenreTitleInline(admin.TabularInline):
+    """Жанры произведения в его административной панели."""
+
+    model = GenreTitle
+    extra = 1
+
+
 class TitleAdmin(admin.ModelAdmin):
     """Административная панель произведений."""
 
+    inlines = (GenreTitleInline,)
+
     list_display = ('pk', 'name', 'description', 'year', 'category')
     search_fields = ('name',)
     list_filter = ('year', 'category')
@@ -1,6 +1,7 @@
 """Модуль конфига приложения."""
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
@@ -8,3 +9,10 @@ class ReviewsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        """Подключает сигналы приложения и создание поискового индекса."""
+        from reviews import signals  # noqa: F401
+        from reviews.search import install_search
+
+        post_migrate.connect(install_search, sender=self)
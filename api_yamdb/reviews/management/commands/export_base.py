@@ -0,0 +1,88 @@
+"""Модуль для выгрузки данных моделей Django в CSV файлы."""
+
+import gzip
+import time
+from csv import writer
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.management.commands.import_base import TABLES
+
+# Колонки CSV файлов в формате, который принимает команда import_base.
+COLUMNS = {
+    'users.csv': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+                  'last_name'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'category.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category', 'description'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+
+class Command(BaseCommand):
+    """Команда для выгрузки данных в CSV."""
+
+    help = 'Выгрузка данных в csv файлы в формате команды import_base'
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы команды."""
+        parser.add_argument(
+            'path',
+            type=Path,
+            help='Папка, в которую будут записаны CSV файлы',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы в формат .csv.gz',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество строк, читаемых из базы за один раз',
+        )
+
+    def open_table(self, filename):
+        """Открывает файл таблицы на запись."""
+        if self.compress:
+            return gzip.open(self.path / f'{filename}.gz', 'wt',
+                             encoding='utf8', newline='')
+        return open(self.path / filename, 'w', encoding='utf8', newline='')
+
+    def export_table(self, filename, model):
+        """Построчно выгружает таблицу, не загружая её в память целиком."""
+        columns = COLUMNS[filename]
+        attnames = [model._meta.get_field(column).attname
+                    for column in columns]
+        rows = model.objects.order_by('pk').values_list(*attnames).iterator(
+            chunk_size=self.chunk_size)
+        started = time.monotonic()
+        count = 0
+        with self.open_table(filename) as file:
+            csv_writer = writer(file, lineterminator='\n')
+            csv_writer.writerow(columns)
+            for row in rows:
+                csv_writer.writerow(
+                    value.isoformat() if isinstance(value, datetime)
+                    else value
+                    for value in row
+                )
+                count += 1
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Данные для {model.__name__} выгружены: {count} строк за '
+            f'{elapsed:.2f} с ({count / max(elapsed, 1e-6):.0f} строк/с)')
+
+    def handle(self, *args, **options):
+        """Обработка команды."""
+        self.path = options['path']
+        self.compress = options['gzip']
+        self.chunk_size = options['chunk_size']
+        self.path.mkdir(parents=True, exist_ok=True)
+        for filename, model, _ in TABLES:
+            self.export_table(filename, model)
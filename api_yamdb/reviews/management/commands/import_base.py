@@ -1,135 +1,302 @@
 """Модуль для импорта данных из CSV файлов в модели Django."""
 
+import gzip
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from csv import DictReader
+from graphlib import TopologicalSorter
+from io import StringIO
+from itertools import islice
+from pathlib import Path
 
+import django
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import F, UniqueConstraint
 
 from api_yamdb.settings import BASE_DIR
 from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
 from users.models import User
 
+# Файл, модель и ссылки на другие модели для каждой загружаемой таблицы.
+TABLES = (
+    ('users.csv', User, {}),
+    ('genre.csv', Genre, {}),
+    ('category.csv', Category, {}),
+    ('titles.csv', Title, {'category': Category}),
+    ('genre_title.csv', GenreTitle, {'title_id': Title, 'genre_id': Genre}),
+    ('review.csv', Review, {'title_id': Title, 'author': User}),
+    ('comments.csv', Comments, {'review_id': Review, 'author': User}),
+)
+TABLES_BY_FILE = {table[0]: table for table in TABLES}
+
+
+def open_table(path, filename):
+    """Открывает CSV файл таблицы или его сжатую копию с суффиксом .gz."""
+    compressed = path / f'{filename}.gz'
+    if not (path / filename).exists() and compressed.exists():
+        return gzip.open(compressed, 'rt', encoding='utf8')
+    return open(path / filename, encoding='utf8')
+
+
+def dependency_graph():
+    """Строит граф зависимостей таблиц по ссылкам между моделями."""
+    files = {model: filename for filename, model, _ in TABLES}
+    return {filename: {files[ref_model] for ref_model in refs.values()}
+            for filename, _, refs in TABLES}
+
+
+def init_worker():
+    """Готовит процесс пула к работе с собственными соединениями."""
+    django.setup()
+    connections.close_all()
+
+
+def import_in_worker(filename, path, chunk_size, batch_size):
+    """Загружает одну таблицу в процессе пула и возвращает отчёт."""
+    output = StringIO()
+    command = Command(stdout=output)
+    command.path = path
+    command.chunk_size, command.batch_size = chunk_size, batch_size
+    command.import_table(*TABLES_BY_FILE[filename])
+    return output.getvalue()
+
 
 class Command(BaseCommand):
     """Команда для импорта данных из CSV."""
 
     help = 'Импорт данных из csv файлов'
 
-    def import_user(self):
-        """Импортирует данные для модели User."""
-        if User.objects.exists():
-            print('Данные для User уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/users.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                users_to_create = [
-                    User(id=row['id'], username=row['username'],
-                         email=row['email'], role=row['role'], bio=row['bio'],
-                         first_name=row['first_name'],
-                         last_name=row['last_name'])
-                    for row in reader]
-                User.objects.bulk_create(users_to_create)
-                print('Данные для User загружены')
-
-    def import_genre(self):
-        """Импортирует данные для модели Genre."""
-        if Genre.objects.exists():
-            print('Данные для Genre уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/genre.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                genres_to_create = [
-                    Genre(id=row['id'], name=row['name'], slug=row['slug'])
-                    for row in reader]
-                Genre.objects.bulk_create(genres_to_create)
-                print('Данные для Genre загружены')
-
-    def import_category(self):
-        """Импортирует данные для модели Category."""
-        if Category.objects.exists():
-            print('Данные для Category уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/category.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                categories_to_create = [
-                    Category(id=row['id'], name=row['name'], slug=row['slug'])
-                    for row in reader]
-                Category.objects.bulk_create(categories_to_create)
-                print('Данные для Category загружены')
-
-    def import_title(self):
-        """Импортирует данные для модели Title."""
-        if Title.objects.exists():
-            print('Данные для Title уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/titles.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                titles_to_create = []
-                for row in reader:
-                    category_id = row.pop('category')
-                    category = Category.objects.get(id=category_id)
-                    title = Title(category=category, **row)
-                    titles_to_create.append(title)
-                Title.objects.bulk_create(titles_to_create)
-                print('Данные для Title загружены')
-
-    def import_genre_title(self):
-        """Импортирует данные для модели GenreTitle."""
-        if GenreTitle.objects.exists():
-            print('Данные для GenreTitle уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/genre_title.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                genre_titles_to_create = [
-                    GenreTitle(id=row['id'], title_id=row['title_id'],
-                               genre_id=row['genre_id']) for row in reader]
-                GenreTitle.objects.bulk_create(genre_titles_to_create)
-                print('Данные для GenreTitle загружены')
-
-    def import_review(self):
-        """Импортирует данные для модели Review."""
-        if Review.objects.exists():
-            print('Данные для Review уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/review.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                reviews_to_create = []
-                for row in reader:
-                    author_id = row.pop('author')
-                    author = User.objects.get(id=author_id)
-                    review = Review(author=author, **row)
-                    reviews_to_create.append(review)
-                Review.objects.bulk_create(reviews_to_create)
-                print('Данные для Review загружены')
-
-    def import_comments(self):
-        """Импортирует данные для модели Comment."""
-        if Comments.objects.exists():
-            print('Данные для Comment уже загружены')
-        else:
-            with open(BASE_DIR / 'static/data/comments.csv',
-                      encoding='utf8') as file:
-                reader = DictReader(file)
-                comments_to_create = []
-                for row in reader:
-                    author_id = row.pop('author')
-                    author = User.objects.get(id=author_id)
-                    comment = Comments(author=author, **row)
-                    comments_to_create.append(comment)
-                Comments.objects.bulk_create(comments_to_create)
-                print('Данные для Comment загружены')
-
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        """Добавляет аргументы команды."""
+        parser.add_argument(
+            '--path',
+            type=Path,
+            default=BASE_DIR / 'static/data',
+            help='Папка с CSV файлами (допускаются сжатые файлы .csv.gz)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Количество строк, загружаемых в одной транзакции',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество строк в одном INSERT',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов для параллельной загрузки независимых '
+                 'таблиц, 0 - по числу ядер',
+        )
+
+    @staticmethod
+    def load_ids(model):
+        """Загружает id всех объектов модели одним запросом."""
+        return {str(pk) for pk in model.objects.values_list('pk', flat=True)}
+
+    def is_dangling(self, filename, row, refs):
+        """Сообщает о строке, ссылающейся на несуществующие объекты."""
+        dangling = [f'{column}={row[column]}'
+                    for column, (ids, null) in refs.items()
+                    if row[column] not in ids
+                    and not (null and not row[column])]
+        if dangling:
+            self.stdout.write(f'{filename}: строка с id={row["id"]} '
+                              f'пропущена, нет объектов {", ".join(dangling)}')
+        return bool(dangling)
+
+    def read_chunks(self, filename):
+        """Читает CSV файл по частям, не загружая его в память целиком."""
+        with open_table(self.path, filename) as file:
+            reader = DictReader(file)
+            while True:
+                chunk = list(islice(reader, self.chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def build(model, row):
+        """Создаёт объект модели из строки CSV."""
+        values = {}
+        for column, value in row.items():
+            field = model._meta.get_field(column)
+            if field.null and value == '':
+                value = None
+            values[field.attname] = field.to_python(value)
+        return model(**values)
+
+    @staticmethod
+    def natural_keys(model):
+        """Возвращает уникальные сочетания полей модели, кроме id."""
+        keys = [(field.attname,) for field in model._meta.fields
+                if field.unique and not field.primary_key]
+        keys.extend(
+            tuple(model._meta.get_field(name).attname
+                  for name in constraint.fields)
+            for constraint in model._meta.constraints
+            if isinstance(constraint, UniqueConstraint)
+        )
+        return keys
+
+    def find_existing(self, model, objs):
+        """Сопоставляет объекты из CSV с записями по id и натуральным ключам.
+
+        Возвращает пары (объект из CSV, найденная запись или None).
+        """
+        by_pk = model.objects.in_bulk([obj.pk for obj in objs])
+        pairs = [(obj, by_pk.get(obj.pk)) for obj in objs]
+        for key in self.natural_keys(model):
+            missing = [obj for obj, current in pairs if current is None]
+            if not missing:
+                break
+            lookup = {f'{name}__in': {getattr(obj, name) for obj in missing}
+                      for name in key}
+            by_key = {
+                tuple(getattr(current, name) for name in key): current
+                for current in model.objects.filter(**lookup)
+            }
+            pairs = [
+                (obj, current
+                 or by_key.get(tuple(getattr(obj, name) for name in key)))
+                for obj, current in pairs
+            ]
+        return pairs
+
+    def upsert(self, model, objs, columns, counts):
+        """Добавляет новые и обновляет изменившиеся записи пачкой."""
+        to_create, to_update, changed_fields = [], [], set()
+        for obj, current in self.find_existing(model, objs):
+            if current is None:
+                to_create.append(obj)
+                continue
+            obj.pk = current.pk
+            changed = {name for name in columns
+                       if getattr(obj, name) != getattr(current, name)}
+            if changed:
+                to_update.append((obj, changed))
+                changed_fields |= changed
+            else:
+                counts['unchanged'] += 1
+        model.objects.bulk_create(to_create, batch_size=self.batch_size)
+        if to_update:
+            model.objects.bulk_update([obj for obj, _ in to_update],
+                                      changed_fields,
+                                      batch_size=self.batch_size)
+            self.revoke_tokens(model, to_update)
+        counts['inserted'] += len(to_create)
+        counts['updated'] += len(to_update)
+
+    @staticmethod
+    def revoke_tokens(model, updated):
+        """Отзывает токены пользователей, у которых изменились права.
+
+        bulk_update не вызывает User.save(), поэтому версия токенов
+        увеличивается отдельным запросом.
+        """
+        if model is not User:
+            return
+        revoked = [obj.pk for obj, changed in updated
+                   if changed & set(User.ROLE_FIELDS)]
+        if revoked:
+            User.objects.filter(pk__in=revoked).update(
+                token_version=F('token_version') + 1)
+
+    @staticmethod
+    def compared_columns(model, row):
+        """Возвращает поля строки CSV, изменения которых надо сохранять."""
+        fields = [model._meta.get_field(column) for column in row]
+        return [field.attname for field in fields
+                if not field.primary_key
+                and not getattr(field, 'auto_now_add', False)]
+
+    def import_table(self, filename, model, refs):
+        """Загружает таблицу пачками, каждую в отдельной транзакции.
+
+        В пустую таблицу строки только добавляются, а в заполненной
+        добавляются новые и обновляются изменившиеся записи.
+        """
+        upsert = model.objects.exists()
+        refs = {
+            column: (self.load_ids(ref_model),
+                     model._meta.get_field(column).null)
+            for column, ref_model in refs.items()
+        }
+        counts = Counter()
+        started = time.monotonic()
+        for chunk in self.read_chunks(filename):
+            objs = [self.build(model, row) for row in chunk
+                    if not self.is_dangling(filename, row, refs)]
+            counts['skipped'] += len(chunk) - len(objs)
+            with transaction.atomic():
+                if upsert:
+                    self.upsert(model, objs,
+                                self.compared_columns(model, chunk[0]), counts)
+                else:
+                    model.objects.bulk_create(objs,
+                                              batch_size=self.batch_size)
+                    counts['inserted'] += len(objs)
+        self.report(model, counts, time.monotonic() - started)
+
+    def report(self, model, counts, elapsed):
+        """Выводит итоги загрузки таблицы."""
+        rows = sum(counts.values())
+        self.stdout.write(
+            f'Данные для {model.__name__} загружены: '
+            f'добавлено {counts["inserted"]}, '
+            f'обновлено {counts["updated"]}, '
+            f'без изменений {counts["unchanged"]}, '
+            f'пропущено {counts["skipped"]} за {elapsed:.2f} с '
+            f'({rows / max(elapsed, 1e-6):.0f} строк/с)')
+
+    def import_parallel(self, workers):
+        """Загружает таблицы в пуле процессов по мере готовности зависимостей.
+
+        Каждый процесс открывает собственное соединение с базой данных.
+        """
+        graph = TopologicalSorter(dependency_graph())
+        graph.prepare()
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            running = {}
+            while graph.is_active():
+                for filename in graph.get_ready():
+                    future = pool.submit(import_in_worker, filename, self.path,
+                                         self.chunk_size, self.batch_size)
+                    running[future] = filename
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.stdout.write(future.result(), ending='')
+                    graph.done(running.pop(future))
+
+    @staticmethod
+    def reset_sequences():
+        """Сдвигает счётчики id за максимальные загруженные значения."""
+        models = [model for _, model, _ in TABLES]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def handle(self, *args, **options):
         """Обработка команды."""
-        self.import_user()
-        self.import_genre()
-        self.import_category()
-        self.import_title()
-        self.import_genre_title()
-        self.import_review()
-        self.import_comments()
+        self.path = options['path']
+        self.chunk_size = options['chunk_size']
+        self.batch_size = options['batch_size']
+        workers = options['workers'] or os.cpu_count()
+        if workers > 1:
+            self.import_parallel(workers)
+        else:
+            order = TopologicalSorter(dependency_graph()).static_order()
+            for filename in order:
+                self.import_table(*TABLES_BY_FILE[filename])
+        self.reset_sequences()
+        Title.objects.update_rating()
@@ -0,0 +1,37 @@
+"""Модуль для пересчёта сохранённого рейтинга произведений."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Команда для пересчёта и проверки рейтинга произведений."""
+
+    help = 'Пересчёт и проверка рейтинга произведений по отзывам'
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы команды."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинг, не исправляя расхождения',
+        )
+
+    def handle(self, *args, **options):
+        """Обработка команды."""
+        wrong = Title.objects.with_wrong_rating().count()
+        self.stdout.write(f'Произведений с неверным рейтингом: {wrong}')
+        if options['check']:
+            if wrong:
+                raise CommandError('Рейтинг произведений расходится с '
+                                   'отзывами')
+            return
+        with transaction.atomic():
+            updated = Title.objects.update_rating()
+            wrong = Title.objects.with_wrong_rating().count()
+        if wrong:
+            raise CommandError(f'После пересчёта осталось произведений с '
+                               f'неверным рейтингом: {wrong}')
+        self.stdout.write(f'Рейтинг пересчитан для {updated} произведений')
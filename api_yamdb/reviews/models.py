@@ -2,19 +2,103 @@
 
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import DatabaseError, connections, models, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений с операциями над сохранённым рейтингом."""
+
+    def touch(self, **fields):
+        """Увеличивает версию и время изменения произведений.
+
+        Дополнительные поля обновляются в том же UPDATE.
+        """
+        return self.update(version=F('version') + 1,
+                           modified=timezone.now(), **fields)
+
+    def change_rating(self, score, count):
+        """Атомарно сдвигает сумму и количество оценок на заданные значения."""
+        return self.touch(rating_sum=F('rating_sum') + score,
+                          rating_count=F('rating_count') + count)
+
+    def update_rating(self):
+        """Пересчитывает сумму и количество оценок по отзывам одним UPDATE."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')).order_by().values('title')
+        return self.touch(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0),
+        )
+
+    def bulk_create_returning(self, objs, batch_size=None):
+        """Создаёт произведения пачкой и проставляет им id.
+
+        Если база не возвращает id из INSERT, как SQLite, они читаются после
+        вставки: внутри транзакции новые id идут подряд после прежних.
+        """
+        if connections[self.db].features.can_return_rows_from_bulk_insert:
+            return self.bulk_create(objs, batch_size=batch_size)
+        titles = self.model._base_manager.using(self.db)
+        with transaction.atomic(using=self.db):
+            last = titles.aggregate(last=Max('pk'))['last'] or 0
+            self.bulk_create(objs, batch_size=batch_size)
+            pks = list(titles.filter(pk__gt=last).order_by('pk').values_list(
+                'pk', flat=True))
+        if len(pks) != len(objs):
+            raise DatabaseError('Не удалось определить id новых произведений')
+        for obj, pk in zip(objs, pks):
+            obj.pk = pk
+            obj._state.adding = False
+            obj._state.db = self.db
+        return objs
+
+    def search(self, query):
+        """Ищет произведения по названию и описанию движком из настроек."""
+        from reviews.search import get_search_backend
+
+        return get_search_backend(self.db).search(self, query)
+
+    def with_wrong_rating(self):
+        """Возвращает произведения, у которых рейтинг расходится с отзывами."""
+        return self.annotate(
+            real_sum=Coalesce(Sum('reviews__score'), 0),
+            real_count=Count('reviews'),
+        ).exclude(rating_sum=F('real_sum'), rating_count=F('real_count'))
 
 
 class Title(models.Model):
     """Модель произведений."""
 
+    RATING_FIELDS = ('rating_sum', 'rating_count')
+    COUNTER_FIELDS = RATING_FIELDS + ('version',)
+
     name = models.CharField('Название произведения',
                             max_length=settings.LEN_NAME)
     year = models.PositiveSmallIntegerField('Год произведения', db_index=True)
     category = models.ForeignKey('Category', on_delete=models.SET_NULL,
-                                 null=True, blank=True, related_name='titles')
-    genre = models.ManyToManyField('Genre', blank=True, related_name='titles')
+                                 null=True, blank=True, related_name='titles',
+                                 db_index=False)
+    genre = models.ManyToManyField('Genre', through='GenreTitle', blank=True,
+                                   related_name='titles')
     description = models.TextField('Описание', null=True, blank=True)
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0,
+                                             editable=False)
+    rating_count = models.PositiveIntegerField('Количество оценок',
+                                               default=0, editable=False)
+    version = models.PositiveIntegerField(
+        'Версия', default=0, editable=False,
+        help_text='Растёт при изменении произведения, отзывов и комментариев',
+    )
+    modified = models.DateTimeField('Дата изменения', auto_now=True)
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         """Мета класс."""
@@ -22,11 +106,41 @@ class Title(models.Model):
         ordering = ['name']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        # Составные индексы начинаются с внешнего ключа и заменяют его
+        # собственный индекс, поэтому у таких ключей db_index=False.
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['category', 'name'],
+                         name='title_category_name_idx'),
+        ]
 
     def __str__(self):
         """Метод возвращает имя объекта."""
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def save(self, *args, **kwargs):
+        """Сохраняет произведение, не перезаписывая счётчики.
+
+        Счётчики рейтинга и версия меняются только через F-выражения
+        в TitleQuerySet, поэтому устаревшие значения в экземпляре не должны
+        затирать их при update.
+        """
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class BaseReview(models.Model):
     """Абстрактный базовый класс для отзывов и комментариев."""
@@ -61,6 +175,7 @@ class Review(BaseReview):
         'Title',
         on_delete=models.CASCADE,
         related_name='reviews',
+        db_index=False,
         verbose_name='Произведение',
         help_text='Выберите произведение, к которому хотите оставить отзыв',
     )
@@ -80,16 +195,28 @@ class Review(BaseReview):
 
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
         constraints = [
             models.UniqueConstraint(fields=['author', 'title'],
                                     name='unique_review'),
         ]
+        indexes = [
+            models.Index(fields=['title', '-pub_date', '-id'],
+                         name='review_title_pub_date_idx'),
+        ]
 
     def __str__(self) -> str:
         """Метод возвращает 15 символов отзыва."""
         return self.text[:settings.LEN_TEXT]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные произведение и оценку отзыва."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance.loaded_rating = (loaded.get('title_id'), loaded.get('score'))
+        return instance
+
 
 class Comments(BaseReview):
     """Модель комментария."""
@@ -98,6 +225,7 @@ class Comments(BaseReview):
         Review,
         on_delete=models.CASCADE,
         related_name='comments',
+        db_index=False,
         verbose_name='Отзыв',
         help_text='Отзыв, к которому оставляют комментарий',
     )
@@ -107,7 +235,11 @@ class Comments(BaseReview):
 
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
+        indexes = [
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comment_review_pub_date_idx'),
+        ]
 
     def __str__(self) -> str:
         """Метод возвращает 15 символов комментария."""
@@ -155,13 +287,27 @@ class Genre(models.Model):
 class GenreTitle(models.Model):
     """Модель связи между жанрами и произведениями."""
 
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
-    title = models.ForeignKey(Title, on_delete=models.CASCADE)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE,
+                              db_index=False)
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              db_index=False)
 
     class Meta:
-        """Мета класс."""
+        """Мета класс.
+
+        Уникальное сочетание (title, genre) служит индексом для жанров
+        произведения, а обратный индекс - для фильтра по жанру.
+        """
 
         verbose_name = 'Жанр-Произведение'
+        constraints = [
+            models.UniqueConstraint(fields=['title', 'genre'],
+                                    name='unique_genre_title'),
+        ]
+        indexes = [
+            models.Index(fields=['genre', 'title'],
+                         name='genretitle_genre_title_idx'),
+        ]
 
     def __str__(self):
         """Возвращает принадлежность произведения к жанру."""
@@ -0,0 +1,124 @@
+"""Модуль полнотекстового поиска произведений."""
+
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+from reviews.models import Title
+
+
+class SearchBackend:
+    """Интерфейс поискового движка по названию и описанию произведений."""
+
+    def is_supported(self, connection):
+        """Проверяет, что движок работает с этой базой данных."""
+        return True
+
+    def install(self, connection):
+        """Создаёт в базе структуры, нужные для поиска."""
+
+    def search(self, queryset, query):
+        """Фильтрует произведения по запросу и упорядочивает по релевантности.
+
+        Релевантность записывается в аннотацию search_rank, меньшее значение
+        означает более подходящее произведение.
+        """
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(SearchBackend):
+    """Поиск подстроки без индекса для баз без полнотекстового поиска."""
+
+    def search(self, queryset, query):
+        """Ищет подстроку, совпадения в названии выше совпадений в описании."""
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(
+            search_rank=Case(When(name__icontains=query, then=Value(0)),
+                             default=Value(1), output_field=IntegerField())
+        ).order_by('search_rank', 'name')
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """
+    Поиск через виртуальную таблицу FTS5 в SQLite.
+
+    Таблица хранит только индекс по содержимому reviews_title и обновляется
+    триггерами на вставку, изменение и удаление произведений.
+    """
+
+    table = f'{Title._meta.db_table}_fts'
+    # Вес совпадений в названии и в описании для bm25.
+    weights = (10.0, 1.0)
+
+    def is_supported(self, connection):
+        """FTS5 доступен только в SQLite."""
+        return connection.vendor == 'sqlite'
+
+    def install(self, connection):
+        """Создаёт таблицу индекса с триггерами и заполняет её."""
+        titles, fts = Title._meta.db_table, self.table
+        with connection.cursor() as cursor:
+            if fts in connection.introspection.table_names(cursor):
+                return
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE {fts} USING fts5(name, description, '
+                f"content='{titles}', content_rowid='id')")
+            cursor.execute(
+                f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {titles} BEGIN '
+                f'INSERT INTO {fts}(rowid, name, description) '
+                f'VALUES (new.id, new.name, new.description); END')
+            cursor.execute(
+                f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {titles} BEGIN '
+                f'INSERT INTO {fts}({fts}, rowid, name, description) '
+                f"VALUES ('delete', old.id, old.name, old.description); END")
+            cursor.execute(
+                f'CREATE TRIGGER {fts}_au AFTER UPDATE OF name, description '
+                f'ON {titles} BEGIN '
+                f'INSERT INTO {fts}({fts}, rowid, name, description) '
+                f"VALUES ('delete', old.id, old.name, old.description); "
+                f'INSERT INTO {fts}(rowid, name, description) '
+                f'VALUES (new.id, new.name, new.description); END')
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    @staticmethod
+    def match_expression(query):
+        """Превращает запрос в выражение MATCH из префиксов его слов."""
+        return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+    def search(self, queryset, query):
+        """Ищет произведения по индексу и сортирует их по bm25.
+
+        Таблица индекса присоединяется к произведениям по rowid, поэтому
+        MATCH выполняется один раз на запрос, а не для каждого совпадения.
+        """
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        titles, fts = Title._meta.db_table, self.table
+        weights = ', '.join(map(str, self.weights))
+        return queryset.extra(
+            tables=[fts],
+            where=[f'{fts} MATCH %s', f'{fts}.rowid = {titles}.id'],
+            params=[match],
+            select={'search_rank': f'bm25({fts}, {weights})'},
+        ).order_by('search_rank', 'name')
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Возвращает движок из TITLE_SEARCH_BACKEND, если база его поддерживает.
+
+    Иначе используется поиск подстроки.
+    """
+    backend = import_string(settings.TITLE_SEARCH_BACKEND)()
+    if backend.is_supported(connections[using]):
+        return backend
+    return ContainsSearchBackend()
+
+
+def install_search(sender, using, **kwargs):
+    """Создаёт структуры поиска после миграций."""
+    get_search_backend(using).install(connections[using])
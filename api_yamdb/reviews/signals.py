@@ -0,0 +1,97 @@
+"""Модуль сигналов приложения reviews."""
+
+from django.db.models import Q
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comments, Genre, GenreTitle, Review,
+                            Title)
+from users.models import User
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге произведения."""
+    title_id, score = instance.title_id, instance.__dict__.get('score')
+    if created:
+        Title.objects.filter(pk=title_id).change_rating(score, 1)
+    else:
+        old_title_id, old_score = getattr(
+            instance, 'loaded_rating', (None, None))
+        if (old_title_id, old_score) == (title_id, score):
+            Title.objects.filter(pk=title_id).touch()
+        elif old_score is None or score is None:
+            Title.objects.filter(
+                pk__in={old_title_id, title_id}).update_rating()
+        else:
+            Title.objects.filter(pk=old_title_id).change_rating(-old_score, -1)
+            Title.objects.filter(pk=title_id).change_rating(score, 1)
+    instance.loaded_rating = (title_id, score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга произведения."""
+    score = instance.__dict__.get('score')
+    titles = Title.objects.filter(pk=instance.title_id)
+    if score is None:
+        titles.update_rating()
+    else:
+        titles.change_rating(-score, -1)
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def touch_title_on_comment(sender, instance, **kwargs):
+    """Обновляет версию произведения при изменении комментариев к нему."""
+    Title.objects.filter(reviews=instance.review_id).touch()
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_titles_on_category(sender, instance, **kwargs):
+    """Обновляет версию произведений изменённой или удаляемой категории."""
+    Title.objects.filter(category=instance).touch()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_on_genre(sender, instance, **kwargs):
+    """Обновляет версию произведений изменённого или удаляемого жанра."""
+    Title.objects.filter(genre=instance).touch()
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def touch_title_on_genre_link(sender, instance, **kwargs):
+    """Обновляет версию произведения при изменении его связи с жанром."""
+    Title.objects.filter(pk=instance.title_id).touch()
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    """Обновляет версию произведений, у которых изменился список жанров."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        Title.objects.filter(pk=instance.pk).touch()
+    elif pk_set:
+        Title.objects.filter(pk__in=pk_set).touch()
+    else:
+        Title.objects.filter(genre=instance).touch()
+
+
+@receiver(post_save, sender=User)
+def touch_titles_on_username(sender, instance, created, **kwargs):
+    """Обновляет версию произведений с отзывами и комментариями автора.
+
+    Имя автора показывается в отзывах и комментариях, поэтому после
+    переименования их прежние ETag становятся неверными.
+    """
+    if created or not instance.username_changed:
+        return
+    Title.objects.filter(
+        Q(reviews__author=instance) | Q(reviews__comments__author=instance)
+    ).touch()
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import User
+from .models import OutboxEmail, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -19,4 +19,20 @@ class UserAdmin(admin.ModelAdmin):
     )
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Класс для отображения очереди писем в админке."""
+
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'created',
+        'sent_at',
+        'attempts',
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -0,0 +1 @@
+"""Модуль содержит команды управления."""
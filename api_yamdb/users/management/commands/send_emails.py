@@ -0,0 +1,121 @@
+"""Модуль для отправки писем из очереди."""
+
+import time
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    """Команда для отправки писем из очереди."""
+
+    help = 'Отправка писем из очереди пачками через одно соединение'
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы команды."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=settings.OUTBOX_MAX_ATTEMPTS,
+            help='Количество попыток отправки письма',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Пауза между проходами по очереди в секундах, '
+                 '0 - отправить накопившиеся письма и завершиться',
+        )
+
+    @staticmethod
+    def send(email, connection):
+        """Отправляет письмо и запоминает результат попытки."""
+        try:
+            EmailMessage(email.subject, email.body, settings.ADMIN_EMAIL,
+                         [email.recipient], connection=connection).send()
+        except Exception as error:
+            email.last_error = str(error)
+        else:
+            email.sent_at = timezone.now()
+            email.last_error = ''
+        email.claimed_until = None
+        return email.sent_at is not None
+
+    def claim_batch(self, last_id):
+        """Занимает пачку писем после last_id и засчитывает им попытку.
+
+        Транзакция держится только на время выбора писем: занятые письма
+        не выбираются другими отправителями до истечения claimed_until.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(Q(claimed_until__isnull=True)
+                        | Q(claimed_until__lt=now),
+                        sent_at__isnull=True,
+                        attempts__lt=self.max_attempts,
+                        id__gt=last_id)[:self.batch_size]
+            )
+            OutboxEmail.objects.filter(
+                id__in=[email.id for email in emails]
+            ).update(
+                attempts=F('attempts') + 1,
+                claimed_until=now + timedelta(seconds=self.claim_timeout),
+            )
+        for email in emails:
+            email.attempts += 1
+        return emails
+
+    def send_batch(self, last_id):
+        """Отправляет пачку писем после last_id и возвращает их."""
+        emails = self.claim_batch(last_id)
+        if not emails:
+            return emails
+        connection = get_connection()
+        # Ошибка соединения будет учтена при отправке каждого письма.
+        with suppress(Exception):
+            connection.open()
+        try:
+            for email in emails:
+                self.stats[self.send(email, connection)] += 1
+        finally:
+            connection.close()
+            with transaction.atomic():
+                OutboxEmail.objects.bulk_update(
+                    emails, ['sent_at', 'last_error', 'claimed_until'])
+        return emails
+
+    def send_pending(self):
+        """Проходит по очереди один раз, каждое письмо - одна попытка."""
+        self.stats = {True: 0, False: 0}
+        emails = self.send_batch(last_id=0)
+        while emails:
+            emails = self.send_batch(last_id=emails[-1].id)
+        if any(self.stats.values()):
+            self.stdout.write(f'Отправлено писем: {self.stats[True]}, '
+                              f'с ошибкой: {self.stats[False]}')
+
+    def handle(self, *args, **options):
+        """Обработка команды."""
+        self.batch_size = options['batch_size']
+        self.max_attempts = options['max_attempts']
+        self.claim_timeout = settings.OUTBOX_CLAIM_TIMEOUT
+        self.send_pending()
+        while options['interval']:
+            time.sleep(options['interval'])
+            self.send_pending()
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Увеличивается при смене прав и отзывает выданные токены', verbose_name='Версия токенов'),
+        ),
+    ]
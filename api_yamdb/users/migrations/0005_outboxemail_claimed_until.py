@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, help_text='Пока срок не истёк, письмо не выбирают другие отправители', null=True, verbose_name='Занято отправителем до'),
+        ),
+    ]
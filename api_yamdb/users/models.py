@@ -35,6 +35,11 @@ class User(AbstractUser):
         blank=True,
         verbose_name='Код доступа',
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия токенов',
+        help_text='Увеличивается при смене прав и отзывает выданные токены',
+    )
 
     class Meta:
         """Мета класс."""
@@ -43,6 +48,36 @@ class User(AbstractUser):
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
 
+    ROLE_FIELDS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные права и имя пользователя."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance.loaded_roles = tuple(
+            loaded.get(field) for field in cls.ROLE_FIELDS)
+        instance.loaded_username = loaded.get('username')
+        return instance
+
+    @property
+    def username_changed(self):
+        """Проверяет, изменилось ли имя с момента загрузки из базы."""
+        loaded = getattr(self, 'loaded_username', None)
+        return loaded is not None and loaded != self.__dict__.get('username')
+
+    def save(self, *args, **kwargs):
+        """Сохраняет пользователя, отзывая его токены при смене прав."""
+        roles = tuple(self.__dict__.get(field) for field in self.ROLE_FIELDS)
+        if getattr(self, 'loaded_roles', roles) != roles:
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'],
+                                           'token_version'}
+        super().save(*args, **kwargs)
+        self.loaded_roles = roles
+        self.loaded_username = self.__dict__.get('username')
+
     # чтобы мы могли обращаться к методам, как к атрибутам
     @property
     def is_admin(self):
@@ -60,3 +95,37 @@ class User(AbstractUser):
             or self.is_staff
             or self.is_admin
         )
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField('Тема', max_length=settings.LEN_NAME)
+    body = models.TextField('Текст')
+    recipient = models.EmailField('Получатель',
+                                  max_length=settings.LENGTH_EMAIL)
+    created = models.DateTimeField('Поставлено в очередь', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попыток отправки',
+                                                default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    claimed_until = models.DateTimeField(
+        'Занято отправителем до', null=True, blank=True,
+        help_text='Пока срок не истёк, письмо не выбирают другие '
+                  'отправители',
+    )
+
+    class Meta:
+        """Мета класс."""
+
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+        indexes = [
+            models.Index(fields=['sent_at', 'attempts', 'id'],
+                         name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        """Возвращает получателя и тему письма."""
+        return f'{self.recipient}: {self.subject}'
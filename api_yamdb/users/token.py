@@ -1,6 +1,10 @@
 """Модуль содержит функции для работы с токенами."""
 
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+TOKEN_VERSION_CLAIM = 'token_version'
 
 
 def get_tokens_for_user(user):
@@ -9,3 +13,18 @@ def get_tokens_for_user(user):
     return {
         'token': str(refresh.access_token),
     }
+
+
+def get_access_token(user):
+    """
+    Создаёт access токен пользователя.
+
+    При включённой настройке JWT_ROLE_CLAIMS в токен записываются права
+    пользователя и версия токенов, чтобы проверять права без запроса к базе.
+    """
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIMS:
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from api.authentication import user_cache
+
+    yield
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (invalid_data_for_user_patch_and_creation,
@@ -110,6 +111,11 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.url_signup, data=valid_data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что эндпоинт `{self.url_signup}` не отправляет '
+            'письмо во время запроса, а ставит его в очередь.'
+        )
+        call_command('send_emails')
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -159,6 +165,7 @@ class Test00UserRegistration:
         response = admin_client.post(
             self.url_admin_create_user, data=valid_data
         )
+        call_command('send_emails')
         outbox_after = mail.outbox
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -373,3 +380,68 @@ class Test00UserRegistration:
             'пользователя, созданного администратором,  возвращает ответ '
             'со статусом 200.'
         )
+
+    def test_send_emails_retries_failed_delivery(self, client, settings,
+                                                 django_user_model):
+        from users.models import OutboxEmail
+
+        valid_data = {
+            'email': 'test_email@yamdb.fake',
+            'username': 'valid_username_1'
+        }
+        client.post(self.url_signup, data=valid_data)
+        outbox_before_count = len(mail.outbox)
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = 1
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 1, (
+            'Проверьте, что письмо, которое не удалось отправить, остаётся '
+            'в очереди для повторной попытки.'
+        )
+        assert email.last_error
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert valid_data['email'] in mail.outbox[-1].to
+
+    def test_send_emails_skips_claimed_emails(self, client, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from users.models import OutboxEmail
+
+        valid_data = {
+            'email': 'test_email@yamdb.fake',
+            'username': 'valid_username_1'
+        }
+        client.post(self.url_signup, data=valid_data)
+        outbox_before_count = len(mail.outbox)
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutboxEmail.objects.update(
+            claimed_until=timezone.now() + timedelta(minutes=5))
+
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 0, (
+            'Проверьте, что письмо, занятое другим отправителем, не '
+            'отправляется повторно до истечения срока.'
+        )
+        assert len(mail.outbox) == outbox_before_count
+
+        OutboxEmail.objects.update(
+            claimed_until=timezone.now() - timedelta(seconds=1))
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1, (
+            'Проверьте, что письмо с истёкшим сроком занятости '
+            'отправляется другим отправителем.'
+        )
+        assert email.claimed_until is None
+        assert len(mail.outbox) == outbox_before_count + 1
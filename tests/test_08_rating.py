@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        create_single_review(user_client, title_id, 'user review', 2)
+        response = create_single_review(
+            moderator_client, title_id, 'moderator review', 8
+        )
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        review_id = response.json()['id']
+        moderator_client.patch(f'{url}{review_id}/', data={'score': 10})
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        moderator_client.delete(f'{url}{review_id}/')
+        assert self.get_rating(admin_client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+        assert self.get_rating(admin_client, titles[1]['id']) is None
+        call_command('update_rating', check=True)
+
+    def test_02_update_rating_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'user review', 7)
+        Title.objects.filter(pk=title_id).update(rating_sum=1, rating_count=3)
+
+        with pytest.raises(CommandError):
+            call_command('update_rating', check=True)
+        call_command('update_rating')
+        call_command('update_rating', check=True)
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что команда `update_rating` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
@@ -0,0 +1,235 @@
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    def add_titles(self, count):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.first()
+        genres = list(Genre.objects.all())
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    def test_01_title_list_queries(self, client, admin_client,
+                                   django_assert_num_queries):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        for _ in range(2):
+            with django_assert_num_queries(3):
+                response = client.get(url)
+            assert len(response.json()['results']) > 0
+            self.add_titles(3)
+
+    def test_02_title_detail_queries(self, client, admin_client,
+                                     django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert len(response.json()['genre']) == 2
+
+    def test_03_review_and_comment_list_queries(
+            self, client, admin_client, admin, user_client, user,
+            moderator_client, moderator, django_assert_num_queries):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert {review['author'] for review in response.json()['results']} == {
+            review['author'] for review in reviews
+        }
+
+        with django_assert_num_queries(3):
+            response = client.get(f'{url}{reviews[0]["id"]}/comments/')
+        assert {
+            comment['author'] for comment in response.json()['results']
+        } == {comment['author'] for comment in comments}
+
+    def test_04_signup_queries(self, client, django_assert_num_queries):
+        url = '/api/v1/auth/signup/'
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+        # BEGIN, поиск пользователя, запись пользователя и письма в очередь.
+        with django_assert_num_queries(4):
+            response = client.post(url, data=data)
+        assert response.status_code == 200
+        with django_assert_num_queries(4):
+            response = client.post(url, data=data)
+        assert response.status_code == 200
+
+        with django_assert_num_queries(2):
+            response = client.post(
+                url, data={'email': data['email'], 'username': 'other'}
+            )
+        assert response.status_code == 400
+
+    def test_05_authenticated_user_is_cached(self, user_client, user,
+                                             admin_client,
+                                             django_assert_num_queries):
+        url = '/api/v1/users/me/'
+        with django_assert_num_queries(1):
+            response = user_client.get(url)
+        assert response.json()['role'] == 'user'
+        with django_assert_num_queries(0):
+            user_client.get(url)
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == 200
+        with django_assert_num_queries(1):
+            response = user_client.get(url)
+        assert response.json()['role'] == 'moderator', (
+            'Проверьте, что кеш пользователей сбрасывается при изменении '
+            'пользователя.'
+        )
+
+    def test_06_role_claims_token(self, client, admin_client, settings,
+                                  django_user_model,
+                                  django_assert_num_queries):
+        settings.JWT_ROLE_CLAIMS = True
+        django_user_model.objects.create(
+            username='claims', email='claims@yamdb.fake', role='moderator',
+            confirmation_code='claimscode'
+        )
+        data = {'username': 'claims', 'confirmation_code': 'claimscode'}
+
+        def get_client():
+            response = client.post('/api/v1/auth/token/', data=data)
+            token_client = APIClient()
+            token_client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {response.json()}'
+            )
+            return token_client
+
+        moderator_client = get_client()
+        url = '/api/v1/users/'
+        with django_assert_num_queries(1):
+            response = moderator_client.get(url)
+        assert response.status_code == 403
+        with django_assert_num_queries(0):
+            response = moderator_client.get(url)
+        assert response.status_code == 403, (
+            'Проверьте, что права из токена проверяются без запросов к базе.'
+        )
+
+        admin_client.patch(f'{url}claims/', data={'role': 'admin'})
+        response = moderator_client.get(url)
+        assert response.status_code == 401, (
+            'Проверьте, что смена роли пользователя отзывает его токены.'
+        )
+        admin_token_client = get_client()
+        assert admin_token_client.get(url).status_code == 200
+        response = admin_token_client.get(f'{url}me/')
+        assert response.json()['email'] == 'claims@yamdb.fake'
+
+    def test_07_slug_lookups_use_registry(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Category, Genre
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(10)
+        )
+        Genre.objects.create(name='Драма', slug='drama')
+        data = {
+            'name': 'Терминатор', 'year': 1984, 'category': category.slug,
+            'genre': [f'genre-{idx}' for idx in range(10)],
+        }
+        url = '/api/v1/titles/'
+        admin_client.post(url, data=data)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == 201
+        assert set(response.json()['genre']) == set(data['genre'])
+        lookups = [query['sql'] for query in context.captured_queries
+                   if '"slug" IN' in query['sql']
+                   or '"slug" =' in query['sql']]
+        assert len(lookups) == 2, (
+            'Проверьте, что слаги категорий и жанров при записи '
+            'произведения сверяются с базой одним запросом на модель.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url, {'genre': 'genre-3'})
+        assert response.json()['count'] == 2
+        assert not any('"slug" =' in query['sql']
+                       for query in context.captured_queries), (
+            'Проверьте, что фильтр по жанру не ищет жанр по слагу в базе.'
+        )
+        assert admin_client.get(url, {'genre': 'nothing'}).json()['count'] == 0
+
+        Genre.objects.create(name='Вестерн', slug='western')
+        data['genre'] = ['western']
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что реестр слагов обновляется при создании жанра.'
+        )
+
+    def test_08_stale_registry_is_confirmed_on_write(self, admin_client):
+        from reviews.models import Category, Genre
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        url = '/api/v1/titles/'
+        data = {'name': 'Терминатор', 'year': 1984,
+                'category': category.slug, 'genre': [genre.slug]}
+        assert admin_client.post(url, data=data,
+                                 format='json').status_code == 201
+
+        # Изменение без сигналов, как его видит реестр другого процесса.
+        Genre.objects.filter(pk=genre.pk).update(slug='comedy')
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что при записи произведения слаги из реестра '
+            'сверяются с базой и устаревший слаг отклоняется.'
+        )
+        assert 'genre' in response.json()
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data=[data], format='json')
+        assert response.json()[0]['status'] == 400
+        data['genre'] = ['comedy']
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == 201
+        assert response.json()['genre'] == ['comedy']
+
+    def test_09_stale_registry_expires_on_read(self, admin_client, settings):
+        from api.cache import genre_slugs
+        from reviews.models import Genre, Title
+
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Терминатор', year=1984)
+        title.genre.add(genre)
+        genre_slugs.get_rows()
+
+        # Изменение без сигналов, как его видит реестр другого процесса.
+        Genre.objects.filter(pk=genre.pk).update(slug='comedy')
+        url = '/api/v1/titles/'
+        response = admin_client.get(url, {'genre': 'drama'})
+        assert len(response.json()['results']) == 1, (
+            'Проверьте, что реестр слагов не перечитывается на каждом '
+            'запросе.'
+        )
+        settings.SLUG_REGISTRY_MAX_AGE = 0
+        response = admin_client.get(url, {'genre': 'drama'})
+        assert response.json()['results'] == [], (
+            'Проверьте, что устаревший реестр слагов перечитывается через '
+            'SLUG_REGISTRY_MAX_AGE секунд.'
+        )
+        response = admin_client.get(url, {'genre': 'comedy'})
+        assert len(response.json()['results']) == 1
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def create_reviews(self, django_user_model, title_id, count):
+        from reviews.models import Review
+
+        for idx in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                author=author, title_id=title_id, text=f'review {idx}',
+                score=5
+            )
+
+    def test_01_review_cursor_pagination(self, client, admin_client,
+                                         django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        self.create_reviews(django_user_model, titles[0]['id'], 7)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url)
+        assert response.json()['count'] == 7, (
+            'Проверьте, что постраничная пагинация остаётся режимом по '
+            'умолчанию.'
+        )
+
+        response = client.get(f'{url}?pagination=cursor')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме не выполняется подсчёт '
+            'объектов.'
+        )
+        assert len(data['results']) == 5
+        assert data['next'] and 'cursor=' in data['next']
+
+        response = client.get(data['next'])
+        next_data = response.json()
+        assert len(next_data['results']) == 2
+        assert next_data['next'] is None
+
+        results = data['results'] + next_data['results']
+        assert len({review['id'] for review in results}) == 7
+        pub_dates = [review['pub_date'] for review in results]
+        assert pub_dates == sorted(pub_dates, reverse=True), (
+            'Проверьте, что в курсорном режиме отзывы отсортированы по '
+            'дате публикации.'
+        )
+
+    def count_queries(self, context):
+        return [query['sql'] for query in context.captured_queries
+                if 'COUNT(' in query['sql']]
+
+    def test_02_cached_count(self, admin_client, user_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?genre={genres[0]["slug"]}'
+        assert user_client.get(url).json()['count'] == 1
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(f'{url}&fields=id')
+        assert response.json()['count'] == 1
+        assert not self.count_queries(context), (
+            'Проверьте, что количество объектов для тех же фильтров '
+            'берётся из кеша.'
+        )
+
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'genre': [genres[0]['slug']],
+            'category': titles[0]['category']
+        })
+        assert user_client.get(url).json()['count'] == 2, (
+            'Проверьте, что кеш количества сбрасывается при изменении '
+            'произведений.'
+        )
+
+    def test_03_estimated_count(self, admin_client, user_client,
+                                django_user_model):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        titles, _, _ = create_titles(admin_client)
+        self.create_reviews(django_user_model, titles[0]['id'], 7)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?count=estimated'
+
+        with CaptureQueriesContext(connection) as context:
+            data = user_client.get(url).json()
+        assert not self.count_queries(context), (
+            'Проверьте, что в режиме `count=estimated` не выполняется '
+            'подсчёт объектов.'
+        )
+        assert data['count'] is None
+        assert len(data['results']) == 5
+        assert data['previous'] is None
+        next_data = user_client.get(data['next']).json()
+        assert len(next_data['results']) == 2
+        assert next_data['next'] is None
+        assert next_data['previous'] is not None
+        assert user_client.get(f'{url}&page=3').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+
+        user_client.get(url.replace('?count=estimated', ''))
+        assert user_client.get(url).json()['count'] == 7, (
+            'Проверьте, что в режиме `count=estimated` возвращается '
+            'сохранённое количество объектов.'
+        )
@@ -0,0 +1,202 @@
+import shutil
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    from reviews.management.commands import import_base
+
+    shutil.copytree(
+        f'{MANAGE_PATH}/static/data', tmp_path / 'static' / 'data'
+    )
+    monkeypatch.setattr(import_base, 'BASE_DIR', tmp_path)
+    return tmp_path / 'static' / 'data'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportBase:
+
+    def test_01_import_base(self, data_dir, django_assert_max_num_queries):
+        from reviews.models import Comments, Review, Title
+
+        with django_assert_max_num_queries(40):
+            call_command('import_base')
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comments.objects.count() == 3
+        call_command('update_rating', check=True)
+
+    def test_02_import_base_dangling_rows(self, data_dir, capsys):
+        from reviews.models import Review
+
+        with open(data_dir / 'review.csv', 'a', encoding='utf8') as file:
+            file.write('\n9001,1,"lost author",999,5,2019-09-24T21:08:21Z\n')
+            file.write('9002,999,"lost title",100,5,2019-09-24T21:08:21Z')
+
+        call_command('import_base')
+        assert not Review.objects.filter(pk__in=[9001, 9002]).exists()
+        assert Review.objects.count() == 72
+        output = capsys.readouterr().out
+        assert 'id=9001' in output and 'id=9002' in output, (
+            'Проверьте, что команда `import_base` сообщает о строках со '
+            'ссылками на несуществующие объекты.'
+        )
+
+    def test_03_import_base_in_chunks(self, data_dir, capsys):
+        from reviews.models import GenreTitle, Review
+
+        call_command('import_base', chunk_size=7, batch_size=3)
+        assert GenreTitle.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert 'строк/с' in capsys.readouterr().out, (
+            'Проверьте, что команда `import_base` сообщает о скорости '
+            'загрузки.'
+        )
+        call_command('update_rating', check=True)
+
+    def test_04_import_base_upsert(self, data_dir, capsys):
+        from reviews.models import Genre, Review
+
+        call_command('import_base')
+        capsys.readouterr()
+        call_command('import_base')
+        output = capsys.readouterr().out
+        assert 'добавлено 0, обновлено 0, без изменений 72' in output, (
+            'Проверьте, что повторный запуск `import_base` не меняет уже '
+            'загруженные записи.'
+        )
+
+        with open(data_dir / 'genre.csv', encoding='utf8') as file:
+            genres = file.read().replace(',Драма,', ',Драмы,')
+        with open(data_dir / 'genre.csv', 'w', encoding='utf8') as file:
+            file.write(genres + '\n100,Мюзикл,musical\n')
+        with open(data_dir / 'review.csv', encoding='utf8') as file:
+            reviews = file.read()
+        with open(data_dir / 'review.csv', 'w', encoding='utf8') as file:
+            file.write(reviews.replace(',100,10,', ',100,1,', 1))
+
+        call_command('import_base')
+        output = capsys.readouterr().out
+        assert 'добавлено 1, обновлено 1, без изменений 14' in output, (
+            'Проверьте, что `import_base` добавляет новые и обновляет '
+            'изменившиеся записи.'
+        )
+        assert Genre.objects.get(slug='drama').name == 'Драмы'
+        assert Genre.objects.filter(slug='musical').exists()
+        assert Review.objects.get(pk=1).score == 1
+        call_command('update_rating', check=True)
+
+    def test_05_import_base_dependency_graph(self):
+        from reviews.management.commands.import_base import dependency_graph
+
+        graph = dependency_graph()
+        assert graph['users.csv'] == graph['genre.csv'] == set()
+        assert graph['category.csv'] == set()
+        assert graph['titles.csv'] == {'category.csv'}
+        assert graph['genre_title.csv'] == {'titles.csv', 'genre.csv'}
+        assert graph['review.csv'] == {'titles.csv', 'users.csv'}
+        assert graph['comments.csv'] == {'review.csv', 'users.csv'}
+
+    def test_06_export_base_round_trip(self, data_dir, tmp_path, capsys):
+        from reviews.models import Review, Title
+
+        call_command('import_base')
+        Title.objects.filter(pk=1).update(description='Описание')
+        call_command('export_base', tmp_path / 'dump', gzip=True)
+        assert (tmp_path / 'dump' / 'review.csv.gz').exists()
+
+        Review.objects.filter(pk=1).delete()
+        capsys.readouterr()
+        call_command('import_base', path=tmp_path / 'dump')
+        output = capsys.readouterr().out
+        assert 'добавлено 0, обновлено 0, без изменений 32' in output, (
+            'Проверьте, что выгрузка `export_base` совпадает с данными в базе.'
+        )
+        assert 'добавлено 1, обновлено 0, без изменений 71' in output
+        assert Title.objects.get(pk=1).description == 'Описание'
+        call_command('update_rating', check=True)
+
+    def test_07_import_base_in_workers(self, tmp_path):
+        import json
+        import os
+        import subprocess
+        import sys
+
+        # Процессы пула не видят тестовую базу в памяти, поэтому загрузка
+        # запускается в отдельном процессе с базой во временном файле.
+        (tmp_path / 'import_settings.py').write_text(
+            'from api_yamdb.settings import *  # noqa\n'
+            'DATABASES = {"default": {\n'
+            '    "ENGINE": "django.db.backends.sqlite3",\n'
+            f'    "NAME": {str(tmp_path / "db.sqlite3")!r},\n'
+            '}}\n'
+        )
+        script = (
+            'import json\n'
+            'import django\n'
+            'django.setup()\n'
+            'from django.core.management import call_command\n'
+            'from reviews.models import Comments, GenreTitle, Review, Title\n'
+            'call_command("migrate", run_syncdb=True, verbosity=0)\n'
+            'call_command("import_base", workers=2)\n'
+            'call_command("update_rating", check=True)\n'
+            'print(json.dumps([model.objects.count() for model in '
+            '(Title, Review, Comments, GenreTitle)]))\n'
+        )
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'import_settings',
+            'PYTHONPATH': os.pathsep.join([str(tmp_path), MANAGE_PATH]),
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=MANAGE_PATH, env=env,
+            capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, (
+            'Проверьте, что команда `import_base --workers 2` загружает '
+            'данные и рейтинг после неё сходится с отзывами:\n'
+            f'{result.stderr}'
+        )
+        counts = json.loads(result.stdout.strip().splitlines()[-1])
+        assert counts == [32, 72, 3, 42], (
+            'Проверьте, что при загрузке в несколько процессов загружаются '
+            'все строки.'
+        )
+
+    def test_08_import_base_revokes_demoted_tokens(self, data_dir,
+                                                   settings):
+        from rest_framework.test import APIClient
+
+        from api.authentication import user_cache
+        from users.models import User
+        from users.token import get_access_token
+
+        settings.JWT_ROLE_CLAIMS = True
+        call_command('import_base')
+        admin = User.objects.get(username='capt_obvious')
+        token_client = APIClient()
+        token_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {get_access_token(admin)}')
+        url = '/api/v1/users/'
+        assert token_client.get(url).status_code == 200
+
+        with open(data_dir / 'users.csv', encoding='utf8') as file:
+            users = file.read()
+        with open(data_dir / 'users.csv', 'w', encoding='utf8') as file:
+            file.write(users.replace('capt_obvious@yamdb.fake,admin,',
+                                     'capt_obvious@yamdb.fake,user,'))
+        call_command('import_base')
+        admin.refresh_from_db()
+        assert admin.role == 'user'
+        assert admin.token_version == 1
+        # Команда работает в отдельном процессе, а кеш процесса API
+        # забывает версию токенов через AUTH_USER_CACHE_TTL секунд.
+        user_cache.clear()
+        assert token_client.get(url).status_code == 401, (
+            'Проверьте, что смена роли пользователя через `import_base` '
+            'отзывает его токены.'
+        )
@@ -0,0 +1,98 @@
+import json
+import statistics
+import time
+from http import HTTPStatus
+
+import pytest
+
+ITERATIONS = 200
+
+
+def percentiles(timings):
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49], cuts[98]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Benchmarks:
+
+    def test_01_token_latency(self, client, django_user_model,
+                              django_assert_num_queries):
+        django_user_model.objects.create(
+            username='bench', email='bench@yamdb.fake',
+            confirmation_code='benchcode'
+        )
+        url = '/api/v1/auth/token/'
+        data = {'username': 'bench', 'confirmation_code': 'benchcode'}
+        with django_assert_num_queries(1):
+            client.post(url, data=data)
+
+        timings = []
+        for _ in range(ITERATIONS):
+            started = time.perf_counter()
+            response = client.post(url, data=data)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == HTTPStatus.OK
+        p50, p99 = percentiles(timings)
+        print(f'\n{url}: p50={p50 * 1000:.2f} мс, p99={p99 * 1000:.2f} мс')
+        assert p99 < 0.5, (
+            f'Проверьте скорость работы `{url}`: p99 составляет '
+            f'{p99 * 1000:.0f} мс.'
+        )
+
+    def test_02_json_render_throughput(self, admin_client, user_client):
+        from api.renderers import FastJSONRenderer
+        from api.serializers import TitleGetSerializer
+        from rest_framework.renderers import JSONRenderer
+        from reviews.models import Category, Genre, Title
+
+        from tests.utils import create_single_review, create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(
+            user_client, titles[0]['id'], 'Текст \u2028 отзыва', 7
+        )
+        category = Category.objects.first()
+        genres = list(Genre.objects.all())
+        for idx in range(100):
+            title = Title.objects.create(
+                name=f'Произведение «{idx}»', year=2000, category=category,
+                description='Описание ' * 20
+            )
+            title.genre.set(genres)
+        data = TitleGetSerializer(
+            Title.objects.select_related('category').prefetch_related(
+                'genre'),
+            many=True
+        ).data
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        samples = [data, admin_client.get(url).data]
+
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            started = time.perf_counter()
+            for _ in range(ITERATIONS):
+                renderer.render(data)
+            elapsed = time.perf_counter() - started
+            print(f'\n{type(renderer).__name__}: '
+                  f'{ITERATIONS / elapsed:.0f} страниц/с')
+        for sample in samples:
+            assert FastJSONRenderer().render(sample) == (
+                JSONRenderer().render(sample)
+            ), (
+                'Проверьте, что `FastJSONRenderer` выдаёт тот же JSON, что '
+                'и `JSONRenderer`.'
+            )
+        big = {'id': 2 ** 64, 'ids': [-2 ** 70, 1]}
+        assert FastJSONRenderer().render(big) == JSONRenderer().render(big), (
+            'Проверьте, что целые длиннее 64 бит рендерятся как в '
+            '`JSONRenderer`.'
+        )
+        floats = {'value': 1e16, 'small': 1.5e-7, 'plain': 0.1}
+        assert json.loads(FastJSONRenderer().render(floats)) == (
+            json.loads(JSONRenderer().render(floats))
+        ), 'Проверьте, что числа с порядком не меняют значение.'
+        with pytest.raises(ValueError):
+            JSONRenderer().render({'value': float('nan')})
+        assert FastJSONRenderer().render(
+            {'value': float('nan'), 'inf': float('inf')}
+        ) == b'{"value":null,"inf":null}'
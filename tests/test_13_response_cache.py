@@ -0,0 +1,130 @@
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    def test_01_anonymous_responses_are_cached(self, client, admin_client,
+                                               django_assert_num_queries):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        first = client.get(url)
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный запрос списка произведений '
+            'отдаётся из кеша.'
+        )
+        assert second.json() == first.json()
+        assert client.get(url, {'year': 1940})['X-Cache'] == 'MISS', (
+            'Проверьте, что ответы с разными параметрами кешируются отдельно.'
+        )
+
+    def test_02_authenticated_responses_are_not_cached(self, admin_client):
+        create_titles(admin_client)
+        for _ in range(2):
+            response = admin_client.get('/api/v1/titles/')
+            assert 'X-Cache' not in response
+
+    def test_03_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title_url = f'/api/v1/titles/{title_id}/'
+        reviews_url = f'{title_url}reviews/'
+        assert client.get(title_url).json()['rating'] is None
+        assert client.get(reviews_url).json()['count'] == 0
+
+        create_single_review(user_client, title_id, 'user review', 7)
+        assert client.get(title_url).json()['rating'] == 7, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведения.'
+        )
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что создание отзыва сбрасывает кеш списка отзывов.'
+        )
+
+        category = titles[0]['category']
+        admin_client.delete(f'/api/v1/categories/{category}/')
+        response = client.get(title_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кеш произведений.'
+        )
+
+    def test_04_cache_stats(self, client, admin_client):
+        from api.cache import response_cache
+
+        create_titles(admin_client)
+        hits, misses = (response_cache.stats['hit'],
+                        response_cache.stats['miss'])
+        for _ in range(3):
+            client.get('/api/v1/genres/')
+        assert response_cache.stats['miss'] - misses == 1
+        assert response_cache.stats['hit'] - hits == 2
+
+    def test_05_invalidation_waits_for_commit(self, client):
+        from django.db import transaction
+
+        from api.cache import response_cache
+        from reviews.models import Category
+
+        url = '/api/v1/categories/'
+        generation = response_cache.generation('categories')
+        with transaction.atomic():
+            Category.objects.create(name='Фильм', slug='movie')
+            assert response_cache.generation('categories') == generation, (
+                'Проверьте, что кеш ответов сбрасывается только после '
+                'фиксации транзакции записи.'
+            )
+            client.get(url)
+        assert client.get(url)['X-Cache'] == 'MISS', (
+            'Проверьте, что ответ, закешированный до фиксации транзакции, '
+            'сбрасывается после неё.'
+        )
+        assert client.get(url).json()['count'] == 1
+
+    def test_06_author_rename_invalidates_pages(self, client, admin_client,
+                                                user_client,
+                                                moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review = create_single_review(
+            user_client, titles[0]['id'], 'user review', 5).json()
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        moderator_client.post(comments_url, data={'text': 'comment'})
+        for url in (reviews_url, comments_url):
+            client.get(url)
+            assert client.get(url)['X-Cache'] == 'HIT'
+
+        admin_client.patch('/api/v1/users/TestUser/',
+                           data={'username': 'RenamedUser'})
+        admin_client.patch('/api/v1/users/TestModerator/',
+                           data={'username': 'RenamedModerator'})
+        for url, author in ((reviews_url, 'RenamedUser'),
+                            (comments_url, 'RenamedModerator')):
+            response = client.get(url)
+            assert response['X-Cache'] == 'MISS', (
+                'Проверьте, что переименование автора сбрасывает '
+                f'закешированные ответы `{url}`.'
+            )
+            assert response.json()['results'][0]['author'] == author
+
+    def test_07_route_ids_are_normalized(self, client, admin_client,
+                                         user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/0{title_id}/reviews/'
+        assert client.get(url).json()['count'] == 0
+        assert client.get(url)['X-Cache'] == 'HIT'
+        assert client.get(url, {'count': 'estimated'}).json()['count'] == 0
+
+        create_single_review(user_client, title_id, 'user review', 5)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что область кеша строится по id произведения, а не '
+            'по строке из адреса.'
+        )
+        assert response.json()['count'] == 1
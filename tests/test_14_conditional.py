@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    def assert_not_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_01_etag_and_not_modified(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for url in (f'/api/v1/titles/{titles[0]["id"]}/',
+                    f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+            assert etag.startswith('"'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'сильный `ETag`.'
+            )
+            assert 'Last-Modified' in response
+            self.assert_not_modified(admin_client, url, etag)
+            self.assert_not_modified(client, url, etag)
+            client.get(url)
+            self.assert_not_modified(client, url, etag)
+
+    def test_02_not_modified_skips_serialization(
+            self, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = admin_client.get(url)['ETag']
+        with django_assert_num_queries(1):
+            self.assert_not_modified(admin_client, url, etag)
+
+    def test_03_etag_changes_on_writes(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        etags = {admin_client.get(title_url)['ETag'],
+                 admin_client.get(reviews_url)['ETag']}
+
+        review = create_single_review(
+            user_client, titles[0]['id'], 'user review', 5).json()
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        comments_etag = admin_client.get(comments_url)['ETag']
+        new_etags = {admin_client.get(title_url)['ETag'],
+                     admin_client.get(reviews_url)['ETag']}
+        assert not etags & new_etags, (
+            'Проверьте, что создание отзыва меняет `ETag` произведения и '
+            'списка его отзывов.'
+        )
+
+        response = user_client.post(comments_url, data={'text': 'comment'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert admin_client.get(comments_url)['ETag'] != comments_etag, (
+            'Проверьте, что создание комментария меняет `ETag` списка '
+            'комментариев.'
+        )
+
+        etag = admin_client.get(title_url)['ETag']
+        admin_client.patch(title_url, data={'name': 'Терминатор 2'})
+        response = admin_client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение произведения меняет его `ETag`.'
+        )
+
+    def test_04_etag_changes_on_author_rename(self, admin_client,
+                                              user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review = create_single_review(
+            user_client, titles[0]['id'], 'user review', 5).json()
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        moderator_client.post(comments_url, data={'text': 'comment'})
+        reviews_etag = admin_client.get(reviews_url)['ETag']
+        comments_etag = admin_client.get(comments_url)['ETag']
+
+        admin_client.patch('/api/v1/users/TestUser/',
+                           data={'username': 'RenamedUser'})
+        response = admin_client.get(reviews_url,
+                                    HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование автора меняет `ETag` списка '
+            'отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'RenamedUser'
+
+        admin_client.patch('/api/v1/users/TestModerator/',
+                           data={'username': 'RenamedModerator'})
+        response = admin_client.get(comments_url,
+                                    HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование автора комментария меняет `ETag` '
+            'списка комментариев.'
+        )
+        assert response.json()['results'][0]['author'] == 'RenamedModerator'
@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+msgpack = pytest.importorskip('msgpack')
+
+MSGPACK = 'application/msgpack'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15MessagePack:
+
+    def get_urls(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        return [
+            '/api/v1/',
+            '/api/v1/users/',
+            f'/api/v1/users/{user.username}/',
+            '/api/v1/users/me/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+            f'{review_url}comments/{comments[0]["id"]}/',
+        ]
+
+    def test_01_msgpack_equals_json(self, client, admin_client, admin,
+                                    user_client, user):
+        for url in self.get_urls(admin_client, admin, user_client, user):
+            for api_client in (admin_client, client):
+                expected = api_client.get(url)
+                response = api_client.get(url, HTTP_ACCEPT=MSGPACK)
+                assert response.status_code == expected.status_code
+                assert response['Content-Type'] == MSGPACK, (
+                    f'Проверьте, что GET-запрос к `{url}` с заголовком '
+                    f'`Accept: {MSGPACK}` возвращает ответ в MessagePack.'
+                )
+                assert msgpack.unpackb(response.content) == expected.json(), (
+                    f'Проверьте, что ответ `{url}` в MessagePack совпадает '
+                    'с ответом в JSON.'
+                )
+
+    def test_02_msgpack_request_body(self, admin_client):
+        data = {'name': 'Фэнтези', 'slug': 'fantasy'}
+        response = admin_client.post(
+            '/api/v1/genres/', data=msgpack.packb(data),
+            content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что API принимает тело запроса в MessagePack.'
+        )
+        assert msgpack.unpackb(response.content) == data
+
+        response = admin_client.post(
+            '/api/v1/genres/', data=b'\xc1', content_type=MSGPACK
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
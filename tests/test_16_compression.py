@@ -0,0 +1,69 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Compression:
+
+    @pytest.fixture(autouse=True)
+    def long_titles(self, admin_client):
+        from reviews.models import Title
+
+        self.titles, _, _ = create_titles(admin_client)
+        Title.objects.update(description='Описание произведения. ' * 50)
+
+    def test_01_gzip_json_responses(self, client):
+        from api.middleware import compression_stats
+
+        compressed = compression_stats.totals['gzip_responses']
+        url = '/api/v1/titles/'
+        plain = client.get(url)
+        assert 'Content-Encoding' not in plain, (
+            'Проверьте, что ответ не сжимается без заголовка '
+            '`Accept-Encoding`.'
+        )
+        response = client.get(url, HTTP_ACCEPT_ENCODING='br;q=0.5, gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Encoding'] == 'gzip', (
+            f'Проверьте, что большой ответ `{url}` сжимается gzip, если '
+            'клиент его принимает.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert len(response.content) < len(plain.content)
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+        assert compression_stats.totals['gzip_responses'] == compressed + 1
+        assert compression_stats.ratio > 1
+
+    def test_02_skip_small_refused_and_not_modified(self, admin_client,
+                                                    settings):
+        url = f'/api/v1/titles/{self.titles[0]["id"]}/'
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответ не сжимается кодировкой с `q=0`.'
+        )
+        etag = response['ETag']
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip',
+                                    HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert 'Content-Encoding' not in response
+
+        settings.COMPRESSION_MIN_SIZE = len(admin_client.get(url).content) + 1
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответы меньше `COMPRESSION_MIN_SIZE` не '
+            'сжимаются.'
+        )
+
+    def test_03_brotli(self, client):
+        brotli = pytest.importorskip('brotli')
+
+        url = '/api/v1/titles/'
+        plain = client.get(url)
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.content) == plain.content
@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17SparseFields:
+
+    def test_01_title_fields(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,name,rating'})
+        results = response.json()['results']
+        assert all(set(title) == {'id', 'name', 'rating'}
+                   for title in results), (
+            f'Проверьте, что параметр `fields` в GET-запросе к `{url}` '
+            'оставляет в ответе только перечисленные поля.'
+        )
+        assert len(context.captured_queries) == 2, (
+            'Проверьте, что без поля `genre` жанры не подгружаются.'
+        )
+        assert all('description' not in query['sql']
+                   and 'reviews_category' not in query['sql']
+                   for query in context.captured_queries), (
+            'Проверьте, что невыбранные описание и категория не читаются '
+            'из базы.'
+        )
+
+        response = client.get(url, {'omit': 'description,genre'})
+        title = response.json()['results'][0]
+        assert set(title) == {'id', 'name', 'year', 'rating', 'category'}, (
+            f'Проверьте, что параметр `omit` в GET-запросе к `{url}` '
+            'убирает перечисленные поля из ответа.'
+        )
+        assert set(title['category']) == {'name', 'slug'}
+
+        response = client.get(f'{url}{title["id"]}/', {'fields': 'name'})
+        assert response.json() == {'name': title['name']}
+
+    def test_02_review_and_comment_fields(self, client, admin_client, admin,
+                                          user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, {'fields': 'id,score'})
+        assert {
+            (review['id'], review['score'])
+            for review in response.json()['results']
+        } == {(review['id'], review['score']) for review in reviews}
+        assert all(set(review) == {'id', 'score'}
+                   for review in response.json()['results'])
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        response = client.get(url, {'omit': 'pub_date,review'})
+        assert all(set(comment) == {'id', 'text', 'author'}
+                   for comment in response.json()['results'])
+
+        response = user_client.post(url, data={'text': 'comment'},
+                                    QUERY_STRING='fields=id')
+        assert set(response.json()) >= {'id', 'text', 'author'}, (
+            'Проверьте, что параметр `fields` не влияет на запросы, '
+            'изменяющие данные.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+BACKENDS = ('reviews.search.SQLiteFTSBackend',
+            'reviews.search.ContainsSearchBackend')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleSearch:
+
+    url = '/api/v1/titles/'
+
+    def search(self, client, query, **params):
+        response = client.get(self.url, {'search': query, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_01_search_by_name_and_description(self, client, admin_client,
+                                               settings, backend):
+        settings.TITLE_SEARCH_BACKEND = backend
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(self.url, data={
+            'name': 'Назад в будущее', 'year': 1985,
+            'genre': [titles[0]['genre'][0]],
+            'category': titles[0]['category'],
+            'description': 'Терминатор здесь не появляется'
+        })
+        assert self.search(client, 'Терминатор') == [
+            'Терминатор', 'Назад в будущее'
+        ], (
+            'Проверьте, что поиск находит произведения по названию и '
+            'описанию и ставит совпадения в названии выше.'
+        )
+        assert self.search(client, 'back') == ['Терминатор']
+        assert self.search(client, 'Терминатор', year=1985) == [
+            'Назад в будущее'
+        ]
+        assert self.search(client, 'нет такого') == []
+
+    def test_02_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.url}{titles[0]["id"]}/'
+        admin_client.patch(title_url, data={'name': 'Чужой'})
+        assert self.search(client, 'чуж') == ['Чужой'], (
+            'Проверьте, что поиск учитывает изменённое название.'
+        )
+        assert self.search(client, 'Терминатор') == []
+        admin_client.delete(title_url)
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что удалённые произведения не находятся поиском.'
+        )
+
+    def test_03_special_characters(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('"', 'орешек*', 'AND OR', "'; --", '(Крепкий'):
+            self.search(client, query)
+        assert self.search(client, '"Крепкий орешек"') == ['Крепкий орешек']
+
+    def test_04_common_term_latency(self, client, admin_client):
+        import time
+
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000,
+                  description='Приключения героя')
+            for idx in range(4000)
+        )
+        started = time.perf_counter()
+        response = client.get(self.url, {'search': 'приключения'})
+        elapsed = time.perf_counter() - started
+        data = response.json()
+        assert data['count'] == 4000
+        assert len(data['results']) == 5
+        assert elapsed < 1, (
+            'Проверьте, что поиск по частому слову выполняет MATCH один раз: '
+            f'страница из 4000 совпадений строилась {elapsed:.2f} с.'
+        )
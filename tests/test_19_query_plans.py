@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19QueryPlans:
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def full_scans(self, sql):
+        return [detail for detail in self.query_plan(sql)
+                if detail.startswith('SCAN') and 'INDEX' not in detail]
+
+    def temp_sorts(self, sql):
+        return [detail for detail in self.query_plan(sql)
+                if detail.startswith('USE TEMP B-TREE FOR ORDER BY')]
+
+    def test_01_hot_queries_use_indexes(self, client, admin_client, admin,
+                                        user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        # Страницы, строки которых читаются по индексу сразу в нужном
+        # порядке: запрос страницы с LIMIT не сортирует всю таблицу.
+        # Ответы администратору не кешируются, поэтому запросы выполняются.
+        ordered_urls = [
+            '/api/v1/titles/',
+            f'/api/v1/titles/?category={titles[0]["category"]}',
+            f'{title_url}reviews/',
+            f'{review_url}comments/',
+        ]
+        urls = [
+            '/api/v1/titles/',
+            f'/api/v1/titles/?category={titles[0]["category"]}',
+            f'/api/v1/titles/?genre={titles[0]["genre"][0]}',
+            '/api/v1/titles/?year=1984',
+            '/api/v1/titles/?search=терминатор',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+            f'{review_url}comments/{comments[0]["id"]}/',
+        ]
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                client.get(url)
+            for query in context.captured_queries:
+                assert not self.full_scans(query['sql']), (
+                    f'Проверьте индексы для запроса к `{url}`: '
+                    f'{query["sql"]} читает таблицу целиком.'
+                )
+        for url in ordered_urls:
+            with CaptureQueriesContext(connection) as context:
+                admin_client.get(url)
+            pages = [query for query in context.captured_queries
+                     if ' LIMIT ' in query['sql']]
+            assert pages
+            for query in pages:
+                assert not self.temp_sorts(query['sql']), (
+                    f'Проверьте индексы для запроса к `{url}`: '
+                    f'{query["sql"]} сортирует строки во временном дереве.'
+                )
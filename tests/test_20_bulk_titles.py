@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20BulkTitles:
+
+    def make_items(self, count, genres, category):
+        return [
+            {'name': f'Произведение {idx}', 'year': 2000,
+             'genre': [genre['slug'] for genre in genres[:3]],
+             'category': category['slug'], 'description': f'Описание {idx}'}
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+        items = self.make_items(2, genres, categories[0])
+        items.insert(1, {**items[0], 'genre': ['no-such-genre']})
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{URL}` со '
+            'списком произведений возвращает ответ со статусом 200.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [201, 400, 201], (
+            'Проверьте, что для каждого элемента пачки возвращается свой '
+            'статус.'
+        )
+        assert 'genre' in results[1]['errors']
+        for item, result in zip(items[::2], results[::2]):
+            data = result['data']
+            assert data['id']
+            assert {**data, 'genre': sorted(data['genre'])} == {
+                **item, 'id': data['id'], 'genre': sorted(item['genre'])
+            }
+            title = client.get(f'/api/v1/titles/{data["id"]}/').json()
+            assert title['name'] == item['name']
+            assert len(title['genre']) == 3
+        assert client.get('/api/v1/titles/').json()['count'] == 4, (
+            'Проверьте, что после пакетной записи список произведений '
+            'обновляется.'
+        )
+
+    def test_02_bulk_update(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        items = [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': [genres[2]['slug'], genres[2]['slug']]},
+            {'id': titles[1]['id'], 'year': 1990},
+            {'id': 10 ** 6, 'name': 'Нет такого'},
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        results = response.json()
+        assert [result['status'] for result in results] == [200, 200, 400]
+        assert results[0]['data']['name'] == 'Терминатор 2'
+        assert results[0]['data']['genre'] == [genres[2]['slug']]
+        assert results[1]['data']['year'] == 1990
+        assert results[1]['data']['genre'] == titles[1]['genre'], (
+            'Проверьте, что элемент без жанров не меняет жанры произведения.'
+        )
+
+    def test_03_bulk_queries_do_not_grow(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        counts = []
+        for size in (10, 50):
+            items = self.make_items(size, genres, categories[1])
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(URL, data=items, format='json')
+            assert all(result['status'] == 201 for result in response.json())
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов пакетной записи не зависит от '
+            'количества произведений.'
+        )
+
+    def test_04_bulk_permissions_and_format(self, client, user_client,
+                                            admin_client):
+        response = client.post(URL, data='[]',
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(URL, data=[], format='json').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.post(URL, data={'name': 'x'}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_bulk_repeated_and_invalid_ids(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        pk = titles[0]['id']
+        items = [
+            {'id': pk, 'genre': [genres[0]['slug']]},
+            {'id': pk, 'genre': [genres[0]['slug']]},
+            {'id': True, 'name': 'Не число'},
+            {'id': [pk], 'name': 'Не число'},
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторяющиеся id в пачке не приводят к ошибке '
+            'сервера.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            200, 400, 400, 400
+        ], (
+            'Проверьте, что повторный id и id, не являющийся целым числом, '
+            'отклоняются для отдельного элемента пачки.'
+        )
+        assert all('id' in result['errors'] for result in results[1:])
+        title = admin_client.get(f'/api/v1/titles/{pk}/').json()
+        assert title['genre'] == [
+            {'name': genres[0]['name'], 'slug': genres[0]['slug']}
+        ]
+        assert title['name'] == titles[0]['name']